@@ -0,0 +1,278 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from .config import ALL_CONFIG
+from src.utils.logger import get_logger
+from src.utils.tracing import span
+
+logger = get_logger(__name__)
+
+
+class AgentSpec:
+    """
+    Everything the dispatcher needs to know about one ``nlpEngine``.
+
+    Any setting except the handler can be overridden per agent in the
+    "AGENTS" section of the config, e.g.
+    AGENTS: {banking-os-agent: {timeout: 4.0, max_in_flight: 16}}.
+
+    Attributes:
+        name (str): The ``nlpEngine`` value selecting this agent.
+        handler (Callable): Coroutine function taking the client (and the
+                            agent URL when ``endpoint`` is set) and
+                            returning the reply (str or dict) or None.
+        endpoint (tuple): Path of the agent URL under ``ALL_CONFIG["Urls"]``;
+                          the resolved URL is passed to the handler.
+        timeout (float): Budget in seconds for one attempt, including the
+                         agent's own HTTP calls.
+        retries (int): Extra attempts after a failure, timeout or empty
+                       (None) reply. Only for agents safe to call twice.
+        hedge_after (float | None): Start a second, parallel attempt if the
+                                    first has not answered after this many
+                                    seconds; the first reply wins.
+        max_in_flight (int): Concurrent calls allowed; further turns get
+                             the fallback reply immediately.
+        stream_handler (Callable | None): Function taking the client and
+                                          returning an async iterator of
+                                          reply sentences, used by
+                                          ``stream`` for streamed turns.
+        first_token_timeout (float | None): Budget in seconds for the first
+                                            streamed sentence; the stream
+                                            as a whole gets ``timeout``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        endpoint: Optional[Tuple[str, ...]] = None,
+        timeout: float = 10.0,
+        retries: int = 0,
+        hedge_after: Optional[float] = None,
+        max_in_flight: int = 32,
+        stream_handler: Optional[Callable[[Any], AsyncIterator[str]]] = None,
+        first_token_timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.endpoint = endpoint
+        self.timeout = float(timeout)
+        self.retries = int(retries)
+        self.hedge_after = hedge_after
+        self.max_in_flight = int(max_in_flight)
+        self.stream_handler = stream_handler
+        self.first_token_timeout = first_token_timeout
+
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    @property
+    def url(self) -> Optional[str]:
+        if not self.endpoint:
+            return None
+        value = ALL_CONFIG["Urls"]
+        for key in self.endpoint:
+            value = value[key]
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.timeout,
+            "retries": self.retries,
+            "hedge_after": self.hedge_after,
+            "max_in_flight": self.max_in_flight,
+            "first_token_timeout": self.first_token_timeout,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "latency_avg_s": self.latency_total / self.calls if self.calls else 0.0,
+            "latency_max_s": self.latency_max,
+        }
+
+
+_OVERRIDABLE = {
+    "timeout": float,
+    "retries": int,
+    "hedge_after": float,
+    "max_in_flight": int,
+    "first_token_timeout": float,
+}
+
+
+class AgentRegistry:
+    """
+    The dialogue-manager agents, declared once and dispatched uniformly.
+
+    ``dispatch`` enforces each agent's concurrency limit, timeout, retries
+    and hedging (``stream`` the limit and deadlines of streamed turns), and
+    records its latency, so no handler needs its own
+    policy and one slow backend cannot hold more than its share of turns.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, AgentSpec] = {}
+
+    def register(self, spec: AgentSpec) -> AgentSpec:
+        overrides = ALL_CONFIG.get("AGENTS", {}).get(spec.name, {}) or {}
+        for key, cast in _OVERRIDABLE.items():
+            if key in overrides:
+                value = overrides[key]
+                setattr(spec, key, None if value is None else cast(value))
+        self._specs[spec.name] = spec
+        return spec
+
+    def get(self, name: Optional[str]) -> Optional[AgentSpec]:
+        return self._specs.get(name) if name else None
+
+    def streams(self, name: Optional[str]) -> bool:
+        spec = self.get(name)
+        return spec is not None and spec.stream_handler is not None
+
+    def timeout(self, name: Optional[str], default: float = 10.0) -> float:
+        spec = self.get(name)
+        return spec.timeout if spec is not None else default
+
+    async def dispatch(self, name: Optional[str], client) -> Any:
+        """
+        Run one turn on agent ``name``. Returns "" for unknown agents and
+        None when the agent failed, timed out or was over its limit.
+        """
+        spec = self.get(name)
+        if spec is None:
+            return ""
+
+        if not self._admit(spec):
+            return None
+
+        start = time.perf_counter()
+        try:
+            with span("agent", agent=name):
+                for attempt in range(spec.retries + 1):
+                    result = await self._attempt(spec, client)
+                    if result is not None:
+                        return result
+                    if attempt < spec.retries:
+                        logger.info("Retrying agent %s (attempt %d)", name, attempt + 2)
+                return None
+        finally:
+            self._release(spec, start)
+
+    async def stream(self, name: Optional[str], client) -> AsyncIterator[str]:
+        """
+        Yield the sentences of a streamed turn on agent ``name``. Yields
+        nothing when the agent has no ``stream_handler``, is over its limit,
+        fails, or misses its first-sentence or total deadline; sentences
+        already yielded stay valid.
+        """
+        spec = self.get(name)
+        if spec is None or spec.stream_handler is None or not self._admit(spec):
+            return
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        deadline = loop.time() + spec.timeout
+        first_deadline = loop.time() + (spec.first_token_timeout or spec.timeout)
+        sentences = spec.stream_handler(client)
+        produced = False
+        try:
+            with span("agent", agent=name, streaming=True):
+                while True:
+                    limit = deadline if produced else min(deadline, first_deadline)
+                    try:
+                        sentence = await asyncio.wait_for(
+                            sentences.__anext__(), timeout=max(0.0, limit - loop.time())
+                        )
+                    except StopAsyncIteration:
+                        break
+                    produced = True
+                    yield sentence
+                if not produced:
+                    spec.failures += 1
+        except asyncio.TimeoutError:
+            spec.timeouts += 1
+            logger.error(
+                "Agent %s stream timed out %s",
+                name,
+                "mid-reply" if produced else "before its first sentence",
+            )
+        except Exception as e:
+            spec.failures += 1
+            logger.error("Agent %s stream failed: %s", name, e)
+        finally:
+            await sentences.aclose()
+            self._release(spec, start)
+
+    def _admit(self, spec: AgentSpec) -> bool:
+        if spec.in_flight >= spec.max_in_flight:
+            spec.rejected += 1
+            logger.warning(
+                "Agent %s is at its limit of %d calls in flight", spec.name, spec.max_in_flight
+            )
+            return False
+        spec.in_flight += 1
+        return True
+
+    def _release(self, spec: AgentSpec, start: float):
+        latency = time.perf_counter() - start
+        spec.in_flight -= 1
+        spec.calls += 1
+        spec.latency_total += latency
+        spec.latency_max = max(spec.latency_max, latency)
+
+    async def _attempt(self, spec: AgentSpec, client) -> Any:
+        if spec.hedge_after is None:
+            return await self._call(spec, client)
+
+        tasks = [asyncio.ensure_future(self._call(spec, client))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=spec.hedge_after)
+            if not done:
+                tasks.append(asyncio.ensure_future(self._call(spec, client)))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.result() is not None:
+                        return task.result()
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _call(self, spec: AgentSpec, client) -> Any:
+        try:
+            args = (client, spec.url) if spec.endpoint else (client,)
+            result = await asyncio.wait_for(spec.handler(*args), timeout=spec.timeout)
+            if result is None:
+                # Handlers log their own errors and answer None.
+                spec.failures += 1
+            return result
+        except asyncio.TimeoutError:
+            spec.timeouts += 1
+            logger.error("Agent %s timed out after %ss", spec.name, spec.timeout)
+        except Exception as e:
+            spec.failures += 1
+            logger.error("Agent %s failed: %s", spec.name, e)
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: spec.stats() for name, spec in self._specs.items()}
+
+
+agent_registry = AgentRegistry()
+
+
+def agent_stats() -> Dict[str, Dict[str, Any]]:
+    return agent_registry.stats()
@@ -1,10 +1,12 @@
 class ASRInterface:
-    async def transcribe(self, client):
+    async def transcribe(self, client, audio=None):
         """
         Transcribe the given audio data.
 
         :param client: The client object with all the member variables
                        including the buffer
+        :param audio: The AudioSegment to transcribe. Defaults to the
+                      client's scratch buffer.
         :return: The transcription structure, see for example the
                  faster_whisper_asr.py file.
         """
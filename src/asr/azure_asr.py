@@ -1,7 +1,8 @@
 import azure.cognitiveservices.speech as speechsdk
-import os
 import logging
+from ..audio_utils import AudioSegment
 from ..config import ALL_CONFIG
+from ..inference_executor import run_inference
 
 logger = logging.getLogger(__name__)
 
@@ -19,19 +20,28 @@ class AzureASRClient:
         
         self.speech_config = speechsdk.SpeechConfig(subscription=subscription_key, region=service_region)
 
-    async def transcribe(self, client):
+    async def transcribe(self, client, audio=None):
 
-            file_path = os.path.join(ALL_CONFIG['PATH']['audio_dir'], client.get_file_name())
-            audio_config = speechsdk.audio.AudioConfig(filename=file_path)
+            if audio is None:
+                audio = AudioSegment.from_client(client)
+
+            stream_format = speechsdk.audio.AudioStreamFormat(
+                samples_per_second=audio.sampling_rate,
+                bits_per_sample=audio.samples_width * 8,
+                channels=1,
+            )
+            push_stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+            push_stream.write(audio.to_bytes())
+            push_stream.close()
+
+            audio_config = speechsdk.audio.AudioConfig(stream=push_stream)
             recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=audio_config)
 
-            result = recognizer.recognize_once()
+            result = await run_inference("azure", recognizer.recognize_once)
             if result.reason == speechsdk.ResultReason.RecognizedSpeech:
 
                 if result.text not in ["","No speech could be recognized", None]:
 
-                    os.remove(file_path)
-                    
                     return {"text": result.text}
 
 
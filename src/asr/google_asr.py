@@ -1,11 +1,12 @@
+from ..audio_utils import AudioSegment
 from ..config import ALL_CONFIG
+from ..inference_executor import run_inference
 from google.cloud.speech_v2.types import cloud_speech
 from google.api_core.client_options import ClientOptions
 from google.cloud import speech_v1p1beta1 as speech_v1
 from google.cloud import speech_v2
 import json
 import logging
-import os
 
 logger = logging.getLogger(__name__)
 
@@ -22,28 +23,38 @@ class GoogleASRClient:
         )
         self.v1_client = speech_v1.SpeechClient()
         
-        self.config = speech_v2.RecognitionConfig(
-            auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
-            language_codes=["en-US"],
-            model='latest_short'
-        )
-     
-    async def transcribe_v2(self, client):
+        self._v2_configs = {}
+
+    def _v2_config(self, sampling_rate):
+        # Raw PCM has no header for auto-detection, so the decoding is explicit.
+        config = self._v2_configs.get(sampling_rate)
+        if config is None:
+            config = speech_v2.RecognitionConfig(
+                explicit_decoding_config=cloud_speech.ExplicitDecodingConfig(
+                    encoding=cloud_speech.ExplicitDecodingConfig.AudioEncoding.LINEAR16,
+                    sample_rate_hertz=sampling_rate,
+                    audio_channel_count=1,
+                ),
+                language_codes=["en-US"],
+                model='latest_short'
+            )
+            self._v2_configs[sampling_rate] = config
+        return config
+
+    async def transcribe_v2(self, client, audio=None):
         """
-        Transcribes the audio file for a given client using Google's Speech API v2.
+        Transcribes the audio segment for a given client using Google's Speech API v2.
         """
-        file_path = os.path.join(ALL_CONFIG['PATH']['audio_dir'], client.get_file_name())
+        if audio is None:
+            audio = AudioSegment.from_client(client)
         try:
-            with open(file_path, "rb") as f:
-                audio_content = f.read()
-
             request = cloud_speech.RecognizeRequest(
                 recognizer= ALL_CONFIG['Credentials']['google_asr_recognizer'],
-                config=self.config,
-                content=audio_content
+                config=self._v2_config(audio.sampling_rate),
+                content=audio.to_bytes()
             )
 
-            response = self.speech_client.recognize(request=request)
+            response = await run_inference("google", self.speech_client.recognize, request=request)
             transcriptions = [
                 result.alternatives[0].transcript for result in response.results
             ]
@@ -52,33 +63,28 @@ class GoogleASRClient:
             if concatenated_transcription in ["", ".", ". ", "None", None]:
                 concatenated_transcription = ""
             
-            os.remove(file_path)
             return {"text": concatenated_transcription}
         
         except Exception as e:
             logger.error("Error in GOOGLE ASR pipeline: %s", e)
             return {"text": ""}
         
-    async def transcribe(self, client):
+    async def transcribe(self, client, audio=None):
         """
-        Transcribes the audio file using Speech API v1beta1.
+        Transcribes the audio segment using Speech API v1beta1.
         """
-       
-        file_path = os.path.join(ALL_CONFIG['PATH']['audio_dir'], client.get_file_name())
+        if audio is None:
+            audio = AudioSegment.from_client(client)
         try:
-            
-            with open(file_path, "rb") as f:
-                audio_content = f.read()
-            
-            audio = speech_v1.RecognitionAudio(content=audio_content)
+            recognition_audio = speech_v1.RecognitionAudio(content=audio.to_bytes())
             config = speech_v1.RecognitionConfig(
                 encoding=speech_v1.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=client.sampling_rate,
+                sample_rate_hertz=audio.sampling_rate,
                 language_code="en-US",
                 enable_automatic_punctuation=True,
             )
 
-            response = self.v1_client.recognize(config=config, audio=audio)
+            response = await run_inference("google", self.v1_client.recognize, config=config, audio=recognition_audio)
             transcriptions = [
                 result.alternatives[0].transcript for result in response.results
                 if result.alternatives
@@ -87,7 +93,6 @@ class GoogleASRClient:
             if concatenated_transcription in ["", ".", ". ", "None", None]:
                 concatenated_transcription = ""
                 
-            os.remove(file_path)
             return {"text": concatenated_transcription}
         except Exception as e:
             logger.error("Error in Speech v1 transcription: %s", e)
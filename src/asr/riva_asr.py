@@ -1,10 +1,14 @@
 import riva.client
-import os
 
 import logging
 import requests, json
+from ..audio_utils import AudioSegment
 from ..post_processing_utils import post_process_itn_output
 from ..config import ALL_CONFIG
+from ..inference_executor import run_inference
+from ..utils.metrics import ITN_LATENCY, track_latency
+from .riva_channel_pool import get_riva_channel_pool
+from .riva_config_cache import get_riva_config_cache
 
 from nemo_text_processing.inverse_text_normalization.inverse_normalize import InverseNormalizer
 inverse_normalizer = InverseNormalizer(lang='en')
@@ -19,22 +23,17 @@ logger.addHandler(file_handler)
 
 class RivaASRClient:
     def __init__(self, uri=f"{ALL_CONFIG['Urls']['riva']}", **kwargs):
-        self.auth = riva.client.Auth(uri=uri)
-        self.asr_service = riva.client.ASRService(self.auth)
+        # gRPC channels and RecognitionConfigs are shared process-wide; a
+        # session only remembers which word boosting domain it uses.
+        self.channel_pool = get_riva_channel_pool(uri)
         self.riva_client = riva.client
-        self.offline_config = riva.client.RecognitionConfig(
-            language_code="en-US",
-            max_alternatives=1,
-            enable_automatic_punctuation=True,
-            verbatim_transcripts=False,
-            audio_channel_count=1,
-            sample_rate_hertz=16000, 
-            # model = "parakeet-1.1b-en-US-asr-offline-silero-vad-asr-bls-ensemble",
-            # model = "parakeet-1.1b-en-US-asr-offline-asr-bls-ensemble"
-            # model = "canary-0.6b-turbo-multi-asr-offline-asr-bls-ensemble",
-            # model = "conformer-en-US-asr-offline-asr-bls-ensemble"
-        )
-        
+        self.config_cache = get_riva_config_cache()
+        self.domain = "global"
+        # model = "parakeet-1.1b-en-US-asr-offline-silero-vad-asr-bls-ensemble",
+        # model = "parakeet-1.1b-en-US-asr-offline-asr-bls-ensemble"
+        # model = "canary-0.6b-turbo-multi-asr-offline-asr-bls-ensemble",
+        # model = "conformer-en-US-asr-offline-asr-bls-ensemble"
+        self.model = kwargs.get("model")
 
     def normalize_transcription(self, text: str) -> str:
         if not text or text.strip(". ").strip() == "":
@@ -43,43 +42,45 @@ class RivaASRClient:
         text = inverse_normalizer.inverse_normalize(text, verbose=False)
         return post_process_itn_output(text)
     
-    async def transcribe(self, client):
+    async def transcribe(self, client, audio=None):
     
         try:
-       
-            file_path = os.path.join(ALL_CONFIG['PATH']['audio_dir'], client.get_file_name())
-            with open(file_path, 'rb') as fh:
-                data = fh.read()
-                
-            if client.sampling_rate != 16000:
-                self.offline_config.sample_rate_hertz = client.sampling_rate
-            
-            response = self.asr_service.offline_recognize(data, self.offline_config)
+            if audio is None:
+                audio = AudioSegment.from_client(client)
+
+            offline_config = self.config_cache.get(
+                self.domain, audio.sampling_rate, self.model
+            )
+
+            response = await run_inference(
+                "riva",
+                self.channel_pool.get_asr_service().offline_recognize,
+                audio.to_bytes(),
+                offline_config,
+            )
             
             
             transcriptions = [result.alternatives[0].transcript.strip() for result in response.results]
            
-            concatenated_transcription = self.normalize_transcription(
-                str(" ".join(t for t in transcriptions if t and t.strip()))
-            )
-          
-            os.remove(file_path)
-            
+            with track_latency(ITN_LATENCY, "itn"):
+                concatenated_transcription = await run_inference(
+                    "itn",
+                    self.normalize_transcription,
+                    str(" ".join(t for t in transcriptions if t and t.strip())),
+                )
+
             return {"text": concatenated_transcription}
         
         except Exception as e:
             logger.error("Error in RIVA ASR pipeline: {}".format(e))
             return {"text": ""}
         
-    def update_word_boosting(self, word_boosting_dict=None, domain= "global"):
-        
-        if word_boosting_dict:
-            try:
-                for key, value in word_boosting_dict.items():
-                    self.riva_client.add_word_boosting_to_config(self.offline_config, [key], value)
-                    
-                logger.info(f"word boosting completed for RIVA ASR")
-            except Exception as e:
-                logger.error("Error in updating word boosting in RIVA ASR pipeline : {}".format(e))
-                
-            
+    def update_word_boosting(self, domain="global"):
+        """
+        Switch this session to the precompiled config of ``domain``.
+
+        Boosting lists themselves are registered once per domain through
+        RivaRecognitionConfigCache.set_word_boosting.
+        """
+        self.domain = domain or "global"
+        logger.info(f"RIVA ASR session using word boosting domain {self.domain}")
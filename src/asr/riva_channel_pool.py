@@ -0,0 +1,129 @@
+import itertools
+import logging
+import threading
+
+import grpc
+import riva.client
+
+from ..config import ALL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+logger.setLevel(logging.INFO)
+
+file_handler = logging.FileHandler(ALL_CONFIG["PATH"]["log_file_global"])
+logger.addHandler(file_handler)
+
+
+DEFAULT_POOL_SETTINGS = {
+    "size": 4,
+    "keepalive_time_ms": 30000,
+    "keepalive_timeout_ms": 10000,
+    "warm_up": True,
+    "warm_up_timeout_s": 5.0,
+}
+
+
+def _open_auth(uri, options):
+    """
+    A ``riva.client.Auth`` on a channel opened with ``options``. The pinned
+    client's ``Auth`` takes no channel options, so its own channel (not
+    connected yet) is replaced before any service stub is built on it.
+    """
+    auth = riva.client.Auth(uri=uri)
+    auth.channel.close()
+    auth.channel = grpc.insecure_channel(uri, options=options)
+    return auth
+
+
+class RivaChannelPool:
+    """
+    A fixed set of long-lived gRPC channels to one Riva server.
+
+    Channels are opened once, kept alive with HTTP/2 pings and handed out
+    round-robin, so sessions share connections instead of each building its
+    own ``riva.client.Auth`` on connect.
+    """
+
+    def __init__(
+        self,
+        uri,
+        size=4,
+        keepalive_time_ms=30000,
+        keepalive_timeout_ms=10000,
+        warm_up=True,
+        warm_up_timeout_s=5.0,
+    ):
+        self.uri = uri
+        self.size = max(1, int(size))
+        options = [
+            ("grpc.keepalive_time_ms", int(keepalive_time_ms)),
+            ("grpc.keepalive_timeout_ms", int(keepalive_timeout_ms)),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+        ]
+        self._auths = [_open_auth(uri, options) for _ in range(self.size)]
+        self._services = [riva.client.ASRService(auth) for auth in self._auths]
+        self._next_service = itertools.cycle(self._services)
+        self._tts_services = None
+        self._next_tts_service = None
+        self._lock = threading.Lock()
+
+        logger.info("Opened %d Riva gRPC channels to %s", self.size, uri)
+
+        if warm_up:
+            self.warm_up(timeout=warm_up_timeout_s)
+
+    def warm_up(self, timeout=5.0):
+        """Block until every channel is connected, or ``timeout`` expires."""
+        for auth in self._auths:
+            try:
+                grpc.channel_ready_future(auth.channel).result(timeout=timeout)
+            except grpc.FutureTimeoutError:
+                logger.warning(
+                    "Riva channel to %s not ready after %ss; it will connect "
+                    "on first use",
+                    self.uri,
+                    timeout,
+                )
+                return
+
+    def get_asr_service(self):
+        with self._lock:
+            return next(self._next_service)
+
+    def get_tts_service(self):
+        """Speech synthesis stubs on the same channels, created on first use."""
+        with self._lock:
+            if self._tts_services is None:
+                self._tts_services = [
+                    riva.client.SpeechSynthesisService(auth) for auth in self._auths
+                ]
+                self._next_tts_service = itertools.cycle(self._tts_services)
+            return next(self._next_tts_service)
+
+    def close(self):
+        for auth in self._auths:
+            auth.channel.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_riva_channel_pool(uri=f"{ALL_CONFIG['Urls']['riva']}"):
+    """Return the process-wide channel pool for ``uri``, creating it once."""
+    pool = _pools.get(uri)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(uri)
+        if pool is None:
+            settings = dict(DEFAULT_POOL_SETTINGS)
+            settings.update(
+                ALL_CONFIG.get("RIVA", {}).get("channel_pool", {}) or {}
+            )
+            pool = RivaChannelPool(uri, **settings)
+            _pools[uri] = pool
+    return pool
@@ -0,0 +1,131 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+import riva.client
+
+from ..config import ALL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+logger.setLevel(logging.INFO)
+
+file_handler = logging.FileHandler(ALL_CONFIG["PATH"]["log_file_global"])
+logger.addHandler(file_handler)
+
+
+class RivaRecognitionConfigCache:
+    """
+    Precompiled Riva RecognitionConfigs keyed by
+    (domain, sample rate, model, word boosting version).
+
+    Configs are built once per key and never mutated afterwards, so any
+    number of sessions can pass the same object to ``offline_recognize``.
+    Changing a domain's word boosting bumps its version and rebuilds the
+    configs already in use for it; sessions pick up the new version on their
+    next lookup.
+    """
+
+    def __init__(self, language_code="en-US", model=""):
+        self.language_code = language_code
+        self.model = model
+        self._word_boosting: Dict[str, Dict[str, float]] = {}
+        self._versions: Dict[str, int] = {}
+        self._configs = {}
+        self._lock = threading.Lock()
+
+    def resolve_domain(self, domain: Optional[str]) -> str:
+        """Domains without their own boosting list fall back to "global"."""
+        if domain and self._word_boosting.get(domain):
+            return domain
+        return "global"
+
+    def version(self, domain: str) -> int:
+        return self._versions.get(domain, 0)
+
+    def set_word_boosting(self, domain: str, word_boosting_dict=None):
+        """
+        Replace the boosting list of ``domain`` (None or {} removes it) and
+        rebuild the configs currently cached for it.
+        """
+        with self._lock:
+            if word_boosting_dict:
+                self._word_boosting[domain] = dict(word_boosting_dict)
+            else:
+                self._word_boosting.pop(domain, None)
+            version = self._versions.get(domain, 0) + 1
+
+            stale_keys = [key for key in self._configs if key[0] == domain]
+            for _, sample_rate, model, _ in stale_keys:
+                self._configs[(domain, sample_rate, model, version)] = (
+                    self._build(domain, sample_rate, model)
+                )
+
+            # Publishing the version is the atomic switch-over point.
+            self._versions[domain] = version
+            for key in stale_keys:
+                self._configs.pop(key, None)
+
+        logger.info(
+            "Rebuilt Riva configs for domain %s (version %d, %d words)",
+            domain,
+            version,
+            len(word_boosting_dict or {}),
+        )
+
+    def get(self, domain=None, sample_rate=16000, model=None):
+        domain = self.resolve_domain(domain)
+        model = self.model if model is None else model
+        key = (domain, sample_rate, model, self.version(domain))
+
+        config = self._configs.get(key)
+        if config is None:
+            with self._lock:
+                key = (domain, sample_rate, model, self.version(domain))
+                config = self._configs.get(key)
+                if config is None:
+                    config = self._build(domain, sample_rate, model)
+                    self._configs[key] = config
+        return config
+
+    def _build(self, domain, sample_rate, model):
+        config_args = dict(
+            encoding=riva.client.AudioEncoding.LINEAR_PCM,
+            language_code=self.language_code,
+            max_alternatives=1,
+            enable_automatic_punctuation=True,
+            verbatim_transcripts=False,
+            audio_channel_count=1,
+            sample_rate_hertz=sample_rate,
+        )
+        if model:
+            config_args["model"] = model
+        config = riva.client.RecognitionConfig(**config_args)
+
+        # One speech context per distinct boost score rather than per word.
+        words_by_score = defaultdict(list)
+        for word, score in self._word_boosting.get(domain, {}).items():
+            words_by_score[score].append(word)
+        for score, words in words_by_score.items():
+            riva.client.add_word_boosting_to_config(config, words, score)
+
+        return config
+
+
+_config_cache = None
+_config_cache_lock = threading.Lock()
+
+
+def get_riva_config_cache() -> RivaRecognitionConfigCache:
+    """Return the process-wide RecognitionConfig cache."""
+    global _config_cache
+    if _config_cache is None:
+        with _config_cache_lock:
+            if _config_cache is None:
+                riva_config = ALL_CONFIG.get("RIVA", {})
+                _config_cache = RivaRecognitionConfigCache(
+                    language_code=riva_config.get("language_code", "en-US"),
+                    model=riva_config.get("model", ""),
+                )
+    return _config_cache
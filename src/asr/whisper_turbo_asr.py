@@ -1,12 +1,12 @@
-import os
 import logging
 import torch
-import os
 from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
 
 
 from .asr_interface import ASRInterface
+from ..audio_utils import AudioSegment
 from ..config import ALL_CONFIG
+from ..micro_batcher import get_micro_batcher
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -35,11 +35,27 @@ class WhisperTurbo(ASRInterface):
             
         )
 
-    async def transcribe(self, client):
+        # Utterances from all sessions share forward passes; see BATCHING.whisper.
+        self.batcher = get_micro_batcher(
+            "whisper", self.transcribe_batch, engine="whisper"
+        )
+
+    def transcribe_batch(self, inputs):
+        """
+        Runs one batched generate over ``inputs`` (dicts with "raw" and
+        "sampling_rate") and returns one result per input.
+        """
+        return self.pipe(inputs, batch_size=len(inputs))
+
+    async def transcribe(self, client, audio=None):
         try:
-            file_path = os.path.join(ALL_CONFIG['PATH']['audio_dir'], client.get_file_name())
-            
-            result = self.pipe(file_path)
+            if audio is None:
+                audio = AudioSegment.from_client(client)
+
+            # Raw samples skip the ffmpeg decode the pipeline runs on files.
+            result = await self.batcher.submit(
+                {"raw": audio.to_float32(), "sampling_rate": audio.sampling_rate}
+            )
             
             return result
         
@@ -0,0 +1,115 @@
+from collections import deque
+
+
+class SegmentedAudioBuffer:
+    """
+    An append-only audio buffer kept as a list of immutable frames.
+
+    Appending stores the incoming websocket frame as-is (O(1), no copy) and
+    moving audio between buffers moves frame references. Slices come back as
+    memoryviews over the frames; only a window that spans several frames is
+    joined, and then exactly once.
+
+    ``max_bytes`` caps how much audio the buffer should hold. A plain buffer
+    reports ``is_full`` so its owner can flush it; a ring buffer evicts its
+    oldest frames instead, so it can never grow past the cap.
+
+    Attributes:
+        max_bytes (int | None): Capacity after which ``is_full`` is True.
+        ring (bool): Evict the oldest frames once ``max_bytes`` is exceeded.
+        dropped_bytes (int): Bytes evicted so far by a ring buffer.
+    """
+
+    def __init__(self, max_bytes=None, ring=False):
+        self.max_bytes = max_bytes
+        self.ring = ring
+        self.dropped_bytes = 0
+        self._frames = deque()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    @property
+    def is_full(self) -> bool:
+        return self.max_bytes is not None and self._size >= self.max_bytes
+
+    def append(self, data):
+        """Add one frame. Mutable buffers are frozen, everything else is kept."""
+        if not data:
+            return
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        self._frames.append(data)
+        self._size += len(data)
+        self._evict()
+
+    def extend(self, other):
+        """Move (not copy) every frame of ``other`` to the end of this buffer."""
+        if other is self:
+            return
+        if isinstance(other, SegmentedAudioBuffer):
+            self._frames.extend(other._frames)
+            self._size += other._size
+            other.clear()
+            self._evict()
+        else:
+            self.append(other)
+
+    def _evict(self):
+        if not self.ring or self.max_bytes is None:
+            return
+        while self._size > self.max_bytes and len(self._frames) > 1:
+            frame = self._frames.popleft()
+            self._size -= len(frame)
+            self.dropped_bytes += len(frame)
+
+    def clear(self):
+        self._frames.clear()
+        self._size = 0
+
+    def memoryviews(self):
+        """The buffered frames, each as a zero-copy memoryview."""
+        return [memoryview(frame) for frame in self._frames]
+
+    def view(self, start=0, end=None):
+        """
+        Return bytes ``start:end`` of the buffer.
+
+        A window inside one frame is a zero-copy memoryview; a window across
+        frames is joined into one bytes object.
+        """
+        end = self._size if end is None else min(end, self._size)
+        start = max(0, start)
+        if start >= end:
+            return memoryview(b"")
+
+        parts = []
+        offset = 0
+        for frame in self._frames:
+            frame_end = offset + len(frame)
+            if frame_end > start and offset < end:
+                parts.append(
+                    memoryview(frame)[max(start - offset, 0):min(end, frame_end) - offset]
+                )
+            if frame_end >= end:
+                break
+            offset = frame_end
+
+        if len(parts) == 1:
+            return parts[0]
+        joined = b"".join(parts)
+        # Later views of the same data no longer need another join.
+        if start == 0 and end == self._size:
+            self._frames = deque([joined])
+        return memoryview(joined)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.view())
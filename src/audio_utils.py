@@ -1,31 +1,122 @@
+import asyncio
 import os
 import wave
+
+import numpy as np
+import torch
+
 from .config import ALL_CONFIG
 
 
+class AudioSegment:
+    """
+    A span of mono PCM audio passed from the buffering strategy to the VAD
+    and ASR engines in memory.
+
+    The samples are held once as an immutable buffer; the numpy and torch
+    views below are built on top of it without re-reading or re-encoding the
+    audio.
+
+    Attributes:
+        pcm (bytes | memoryview): Raw little-endian PCM samples.
+        sampling_rate (int): The sampling rate of the audio in Hz.
+        samples_width (int): Bytes per sample (2 for 16-bit PCM).
+    """
+
+    def __init__(self, pcm, sampling_rate=16000, samples_width=2):
+        # A memoryview over a bytearray would pin the client's buffer and
+        # make later clear() calls fail, so mutable buffers are frozen here.
+        if isinstance(pcm, bytearray):
+            pcm = bytes(pcm)
+        self.pcm = pcm
+        self.sampling_rate = sampling_rate
+        self.samples_width = samples_width
+
+    @classmethod
+    def from_client(cls, client):
+        scratch_buffer = client.scratch_buffer
+        if hasattr(scratch_buffer, "view"):
+            # SegmentedAudioBuffer: frames are immutable, so a view is safe
+            # to hold while the buffer keeps growing or is cleared.
+            scratch_buffer = scratch_buffer.view()
+        return cls(
+            scratch_buffer,
+            sampling_rate=client.sampling_rate,
+            samples_width=client.samples_width,
+        )
+
+    def __len__(self):
+        return len(self.pcm)
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / (self.sampling_rate * self.samples_width)
+
+    def slice(self, start_seconds=0.0, end_seconds=None):
+        """Return a zero-copy sub-segment between two offsets in seconds."""
+        bytes_per_second = self.sampling_rate * self.samples_width
+        start = int(start_seconds * bytes_per_second)
+        start -= start % self.samples_width
+        end = len(self.pcm)
+        if end_seconds is not None:
+            end = min(end, int(end_seconds * bytes_per_second))
+            end -= end % self.samples_width
+        return AudioSegment(
+            memoryview(self.pcm)[start:end],
+            sampling_rate=self.sampling_rate,
+            samples_width=self.samples_width,
+        )
+
+    def to_bytes(self) -> bytes:
+        if isinstance(self.pcm, bytes):
+            return self.pcm
+        if (
+            isinstance(self.pcm, memoryview)
+            and isinstance(self.pcm.obj, bytes)
+            and self.pcm.nbytes == len(self.pcm.obj)
+        ):
+            return self.pcm.obj
+        return bytes(self.pcm)
+
+    def to_numpy(self) -> np.ndarray:
+        """int16 samples, viewing the PCM buffer without a copy."""
+        return np.frombuffer(self.pcm, dtype=np.int16)
+
+    def to_float32(self) -> np.ndarray:
+        """float32 samples in [-1, 1], as expected by Whisper."""
+        return self.to_numpy().astype(np.float32) / 32768.0
+
+    def to_waveform(self) -> torch.Tensor:
+        """A (channel, time) float tensor, as expected by pyannote."""
+        return torch.from_numpy(self.to_float32()).unsqueeze(0)
+
+
 async def save_audio_to_file(
     audio_data, file_name, audio_dir=ALL_CONFIG["PATH"]["audio_dir"], audio_format="wav", sampling_rate = 16000
 ):
     """
     Saves the audio data to a file.
 
+    The pipelines consume AudioSegment objects directly; this is only used
+    to keep a copy of the processed audio on disk when
+    ``PATH.save_audio`` is enabled.
+
     :param audio_data: The audio data to save.
     :param file_name: The name of the file.
     :param audio_dir: Directory where audio files will be saved.
     :param audio_format: Format of the audio file.
     :return: Path to the saved audio file.
     """
-    os.makedirs(audio_dir, exist_ok=True)
-
     file_path = os.path.join(audio_dir, file_name)
-    
-        
-    with wave.open(file_path, "wb") as wav_file:
-        wav_file.setnchannels(1)  # Assuming mono audio
-        wav_file.setsampwidth(2)
-        wav_file.setframerate(sampling_rate)
-        wav_file.writeframes(audio_data)
 
-    return file_path
+    def write_wav():
+        os.makedirs(audio_dir, exist_ok=True)
+        with wave.open(file_path, "wb") as wav_file:
+            wav_file.setnchannels(1)  # Assuming mono audio
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sampling_rate)
+            wav_file.writeframes(audio_data)
 
+    await asyncio.to_thread(write_wav)
 
+    return file_path
@@ -1,9 +1,17 @@
 from .config import ALL_CONFIG
-import os
+import asyncio
 import json
 import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
 from openai import AzureOpenAI, AsyncAzureOpenAI
 
+from .chat_history import ChatHistory
+from .utils.http_client import get_http_client
+from .utils.sentence_splitter import SentenceSplitter
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 file_handler = logging.FileHandler(ALL_CONFIG["PATH"]["log_file_global"])
@@ -16,58 +24,109 @@ AZURE_DEPLOYMENT_ID = ALL_CONFIG.get('Credentials', {}).get('azure_openai', {}).
 AZURE_PROXY = ALL_CONFIG.get('Urls', {}).get('proxy', '')
 
 
-def _init_azure_client():
-    """
-    Initialize the Azure OpenAI client using environment variables.
-    """
-    return AzureOpenAI(
-        azure_endpoint=AZURE_ENDPOINT,
-        api_key=AZURE_API_KEY,
-        api_version=AZURE_API_VERSION
-    )
+_azure_clients: Dict[Tuple[str, str, Optional[str], bool], Any] = {}
+_azure_clients_lock = threading.Lock()
 
-def _init_azure_async_client():
-    """
-    Initialize the Async Azure OpenAI client using environment variables.
+
+def get_azure_openai_client(proxy: str = AZURE_PROXY, asynchronous: bool = True):
     """
-    return AsyncAzureOpenAI(
-        azure_endpoint=AZURE_ENDPOINT,
-        api_key=AZURE_API_KEY,
-        api_version=AZURE_API_VERSION
-    )
+    Return the process-wide Azure OpenAI client for the configured endpoint
+    and deployment, going through ``proxy``.
 
+    Clients are built once per (endpoint, deployment, proxy) and kept, so
+    their connection pool stays warm across turns. The proxy is set on the
+    client's own HTTP transport rather than in ``os.environ``, which other
+    sessions would see mid-request.
+    """
+    key = (AZURE_ENDPOINT, AZURE_DEPLOYMENT_ID, proxy or None, asynchronous)
+    client = _azure_clients.get(key)
+    if client is not None and not client.is_closed():
+        return client
+
+    with _azure_clients_lock:
+        client = _azure_clients.get(key)
+        if client is None or client.is_closed():
+            if asynchronous:
+                client = AsyncAzureOpenAI(
+                    azure_endpoint=AZURE_ENDPOINT,
+                    api_key=AZURE_API_KEY,
+                    api_version=AZURE_API_VERSION,
+                    http_client=get_http_client(proxy=proxy or None),
+                )
+            else:
+                client = AzureOpenAI(
+                    azure_endpoint=AZURE_ENDPOINT,
+                    api_key=AZURE_API_KEY,
+                    api_version=AZURE_API_VERSION,
+                    http_client=httpx.Client(proxy=proxy or None),
+                )
+            _azure_clients[key] = client
+    return client
+
+
+EMOTION_SYSTEM_PROMPT = """Detect the emotion in the user's input (calm, neutral, happy, angry, fearful, or sad) and respond accordingly without using special characters:
+
+- Calm/Neutral: Clear, informative, neutral tone.
+- Happy: Positive and enthusiastic.
+- Angry: Acknowledge frustration, offer empathy and solutions.
+- Fearful: Offer reassurance and comfort.
+- Sad: Show empathy and offer a kind, uplifting response.
+
+Respond to every user input with the appropriate emotional tone."""
+
+SUMMARY_PROMPT = (
+    "Update the summary of a conversation between a user and an assistant. "
+    "Keep names, numbers, decisions and open requests; answer with the summary only."
+)
+
+
+def _chat_history(client) -> ChatHistory:
+    history = getattr(client, "chat_history", None)
+    if not isinstance(history, ChatHistory):
+        history = client.chat_history = ChatHistory.from_config(EMOTION_SYSTEM_PROMPT)
+    return history
+
+
+def _schedule_summary(history: ChatHistory, proxy: str):
+    """Fold the turns that left the window into the summary, off the turn's path."""
+    if not history.summarize or (history.summary_task and not history.summary_task.done()):
+        return
+    evicted = history.take_evicted()
+    if evicted:
+        history.summary_task = asyncio.ensure_future(_refresh_summary(history, evicted, proxy))
+
+
+async def _refresh_summary(history: ChatHistory, evicted, proxy: str):
+    transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in evicted)
+    try:
+        response = await get_azure_openai_client(proxy).chat.completions.create(
+            model=AZURE_DEPLOYMENT_ID,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Summary so far: {history.summary or 'none'}\n\nNew turns:\n{transcript}",
+                },
+            ],
+            max_tokens=history.summary_max_tokens,
+        )
+        history.set_summary(response.choices[0].message.content)
+    except Exception as e:
+        logger.error("Error while summarizing the chat history: {}".format(e))
 
 
 async def ask_azure_openai(client, max_tokens: int = 200, proxy: str = AZURE_PROXY):
     
-    if not hasattr(client, "chat_history"):
-        client.chat_history = []
-
-    
-    if proxy:
-        os.environ["https_proxy"] = proxy
+    history = _chat_history(client)
 
     try:
-        azure_client = _init_azure_async_client()
+        azure_client = get_azure_openai_client(proxy)
 
-        prompt_text = f"""
-        Detect the emotion in the user's input (calm, neutral, happy, angry, fearful, or sad) and respond accordingly without using special characters:
-
-        - Calm/Neutral: Clear, informative, neutral tone.
-        - Happy: Positive and enthusiastic.
-        - Angry: Acknowledge frustration, offer empathy and solutions.
-        - Fearful: Offer reassurance and comfort.
-        - Sad: Show empathy and offer a kind, uplifting response.
-
-        Now, respond to the following input with the appropriate emotional tone: {str(client.user_input_txt)}
-        """
-
-       
-        client.chat_history.append({"role": "user", "content": prompt_text})
+        history.add_user(str(client.user_input_txt))
 
         response = await azure_client.chat.completions.create(
             model=AZURE_DEPLOYMENT_ID,
-            messages=client.chat_history,
+            messages=history.messages(),
             max_tokens=max_tokens
         )
 
@@ -75,7 +134,8 @@ async def ask_azure_openai(client, max_tokens: int = 200, proxy: str = AZURE_PRO
         message = response.choices[0].message.content.strip()
 
       
-        client.chat_history.append({"role": "assistant", "content": message})
+        history.add_assistant(message)
+        _schedule_summary(history, proxy)
 
         return message
     
@@ -83,57 +143,111 @@ async def ask_azure_openai(client, max_tokens: int = 200, proxy: str = AZURE_PRO
         logger.error("Error in Azure Openai pipeline: {}".format(e))
         raise
 
-    finally:
-        if proxy:
-            os.environ.pop("https_proxy", None)
-
 
-def classify_emotion(text: str, proxy: str = AZURE_PROXY):
+async def stream_azure_openai(client, max_tokens: int = 200, proxy: str = AZURE_PROXY):
     """
-    Classify emotion in the given text using Azure GPT.
+    Like ``ask_azure_openai``, but consumes the completion as a stream and
+    yields the answer sentence by sentence as soon as each one is complete.
+    The full answer is added to the chat history once the stream ends.
     """
-    
-    if proxy:
-        os.environ["https_proxy"] = proxy
+    history = _chat_history(client)
 
     try:
-        azure_client = _init_azure_client()
+        azure_client = get_azure_openai_client(proxy)
 
-        prompt = (
-            f"Classify the emotion in the text: [{text}]. "
-            "Output only one word from [calm, happy, angry, fearful, sad, neutral]. "
-            "If uncertain, return 'neutral'."
+        history.add_user(str(client.user_input_txt))
+
+        stream = await azure_client.chat.completions.create(
+            model=AZURE_DEPLOYMENT_ID,
+            messages=history.messages(),
+            max_tokens=max_tokens,
+            stream=True,
         )
 
+        splitter = SentenceSplitter()
+        parts = []
+        async for chunk in stream:
+            # Azure sends a content-filter chunk without choices first.
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            for sentence in splitter.feed(delta):
+                yield sentence
+
+        for sentence in splitter.flush():
+            yield sentence
+
+        history.add_assistant("".join(parts).strip())
+        _schedule_summary(history, proxy)
+
+    except Exception as e:
+        logger.error("Error in Azure Openai streaming pipeline: {}".format(e))
+        raise
+
+
+def _emotion_classification_messages(text: str):
+    prompt = (
+        f"Classify the emotion in the text: [{text}]. "
+        "Output only one word from [calm, happy, angry, fearful, sad, neutral]. "
+        "If uncertain, return 'neutral'."
+    )
+    return [{"role": "user", "content": prompt}]
+
+
+def _parse_emotion(response) -> str:
+    emotion = response.choices[0].message.content.strip().lower()
+    if emotion == "cal":
+        emotion = "calm"
+    if emotion == "fear":
+        emotion = "fearful"
+    return emotion
+
+
+def classify_emotion(text: str, proxy: str = AZURE_PROXY):
+    """
+    Classify emotion in the given text using Azure GPT.
+    """
+    try:
+        azure_client = get_azure_openai_client(proxy, asynchronous=False)
+
         response = azure_client.chat.completions.create(
             model=AZURE_DEPLOYMENT_ID,
-            messages=[{"role": "user", "content": prompt}],
+            messages=_emotion_classification_messages(text),
             max_tokens=5
         )
 
-        emotion = response.choices[0].message.content.strip().lower()
-        if emotion == "cal":
-            emotion = "calm"
-        if emotion == "fear":
-            emotion = "fearful"
+        return _parse_emotion(response)
+    except Exception as e:
+        logger.error("Error while Emotion detection in Azure Openai pipeline: {}".format(e))
+        raise
+
+
+async def classify_emotion_async(text: str, proxy: str = AZURE_PROXY):
+    """
+    Async ``classify_emotion``, for running alongside the dialogue manager.
+    """
+    try:
+        azure_client = get_azure_openai_client(proxy)
 
-        return emotion
+        response = await azure_client.chat.completions.create(
+            model=AZURE_DEPLOYMENT_ID,
+            messages=_emotion_classification_messages(text),
+            max_tokens=5
+        )
+
+        return _parse_emotion(response)
     except Exception as e:
         logger.error("Error while Emotion detection in Azure Openai pipeline: {}".format(e))
         raise
         
-    finally:
-        if proxy:
-            os.environ.pop("https_proxy", None)
             
             
 async def chatgpt_entity_extractor_insurance(client, user_input="",proxy: str = AZURE_PROXY):
-    
-    if proxy:
-        os.environ["https_proxy"] = proxy
-
     try:
-        azure_client = _init_azure_async_client()
+        azure_client = get_azure_openai_client(proxy)
 
         prompt_text = f"""
 
@@ -189,9 +303,6 @@ async def chatgpt_entity_extractor_insurance(client, user_input="",proxy: str =
         logger.error("Error in extracting entities via azure openai: {}".format(e))
         return user_input
     
-    finally:
-        if proxy:
-            os.environ.pop("https_proxy", None)
      
     
             
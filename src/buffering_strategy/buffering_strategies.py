@@ -1,12 +1,15 @@
 import asyncio
 import json
-import os
 import time
 from datetime import datetime
 
 from .buffering_strategy_interface import BufferingStrategyInterface
+from ..audio_utils import AudioSegment, save_audio_to_file
 from ..send_response_with_speech import send_dm_response_with_tts
 from ..config import ALL_CONFIG
+from ..inference_executor import InferenceQueueFull
+from ..utils.metrics import ASR_LATENCY, BARGE_INS, PROCESSING_OVERLAPS, VAD_LATENCY, track_latency
+from ..utils.tracing import span, start_trace, use_trace
 
 
 import logging
@@ -22,6 +25,13 @@ file_handler = logging.FileHandler(ALL_CONFIG["PATH"]["log_file_global"])
 logger.addHandler(file_handler)
 
 
+# Overridable through the "BARGE_IN" section of the config.
+BARGE_IN_SETTINGS = {
+    "enabled": True,
+    "min_speech_seconds": 0.3,
+    **(ALL_CONFIG.get("BARGE_IN", {}) or {}),
+}
+
 
 class SilenceAtEndOfChunk(BufferingStrategyInterface):
     """
@@ -68,11 +78,14 @@ class SilenceAtEndOfChunk(BufferingStrategyInterface):
         """
         if (self.client.service == "s2s") and (self.client.user_input_txt):
             
-            
-            asyncio.create_task(
-                    send_dm_response_with_tts(self.client, websocket)
-                )
-            self.client.scratch_buffer.clear()
+            # Typed input: answer it once, and let a new input replace a
+            # turn still in progress.
+            turn = self.client.turn
+            if turn is None or not turn.active or turn.text != self.client.user_input_txt:
+                self.client.start_turn(
+                        send_dm_response_with_tts(self.client, websocket)
+                    )
+            self.clear_scratch_buffer(vad_pipeline)
             
         else:
         
@@ -85,14 +98,21 @@ class SilenceAtEndOfChunk(BufferingStrategyInterface):
             
             if len(self.client.buffer) > chunk_length_in_bytes:
                 if self.processing_flag:
-                    logger.error(
-                        "Error in realtime processing: tried processing a new "
-                        "chunk while the previous one was still being processed"
+                    # VAD and ASR run off the event loop, so a second task
+                    # would snapshot and transcribe the same utterance again.
+                    # The chunk stays in the bounded ring buffer and is taken
+                    # with the next one once the running pass is done.
+                    PROCESSING_OVERLAPS.inc()
+                    logger.warning(
+                        "Deferring a chunk of %s while the previous one is "
+                        "still being processed",
+                        self.client.client_id,
                     )
+                    return
 
 
+                # Moves frame references; no audio bytes are copied.
                 self.client.scratch_buffer += self.client.buffer
-                self.client.buffer.clear()
                 self.processing_flag = True
                 # Schedule the processing in a separate task
                 asyncio.create_task(
@@ -116,30 +136,66 @@ class SilenceAtEndOfChunk(BufferingStrategyInterface):
             asr_pipeline: The automatic speech recognition pipeline.
         """
         
-        vad_results = await vad_pipeline.detect_activity(self.client)
+        # The same in-memory segment is handed to VAD and ASR; nothing is
+        # written to disk unless PATH.save_audio is enabled.
+        audio = AudioSegment.from_client(self.client)
+
+        # One trace per utterance: it spans every VAD pass over the growing
+        # scratch buffer and follows the transcript into the DM/TTS task.
+        if self.client.trace is None:
+            self.client.trace = start_trace(
+                "utterance",
+                client_id=self.client.client_id,
+                session_id=self.client.session_id,
+                asr_engine=self.client.asr_engine,
+            )
+        else:
+            use_trace(self.client.trace)
+
+        try:
+            with track_latency(VAD_LATENCY, "vad"), span("vad"):
+                vad_results = await vad_pipeline.detect_activity(self.client, audio)
+        except InferenceQueueFull as e:
+            # Keep the audio; it is retried together with the next chunk.
+            logger.warning("Skipping VAD for %s: %s", self.client.client_id, e)
+            self.processing_flag = False
+            return
         
         # logger.info("vad results found ------{}".format(vad_results))
         # logger.info("scratch buffer length: %s", len(self.client.scratch_buffer))
         # logger.info("scratch buffer length in seconds: %s",len(self.client.scratch_buffer) / (self.client.sampling_rate * self.client.samples_width))
 
         if len(vad_results) == 0:
-            os.remove(os.path.join(ALL_CONFIG['PATH']['audio_dir'], self.client.get_file_name()))
-            self.client.scratch_buffer.clear()
-            self.client.buffer.clear()
+            # Silence is not an utterance; its trace is dropped unexported.
+            self.client.trace = None
+            # client.buffer only holds chunks that arrived during this pass.
+            self.clear_scratch_buffer(vad_pipeline)
             self.client.increment_file_counter()
             self.processing_flag = False
             return
 
-        last_segment_should_end_before = (
-            len(self.client.scratch_buffer)
-            / (self.client.sampling_rate * self.client.samples_width)
-        ) - self.client.chunk_offset_seconds
+        if self.client.service == "s2s":
+            await self.barge_in(websocket, vad_results)
 
-        
-        if vad_results[-1]["end"] < last_segment_should_end_before:
+        force_flush = self.client.scratch_buffer.is_full
+        if force_flush:
+            logger.warning(
+                "Utterance of %s reached %ss; flushing it to ASR",
+                self.client.client_id,
+                self.client.max_utterance_seconds,
+            )
+
+        if force_flush or vad_pipeline.end_of_speech(
+            self.client, vad_results, audio, self.client.chunk_offset_seconds
+        ):
             
+            trace, self.client.trace = self.client.trace, None
+
             start = time.time()
-            transcription = await asr_pipeline.transcribe(self.client)
+            with track_latency(ASR_LATENCY, "asr", engine=self.client.asr_engine), span(
+                "asr", engine=self.client.asr_engine
+            ):
+                transcription = await asr_pipeline.transcribe(self.client, audio)
 
             
             
@@ -147,7 +203,13 @@ class SilenceAtEndOfChunk(BufferingStrategyInterface):
 
                 end = time.time()
                 transcription["processing_time"] = end - start
-                logger.info(f"reference audio file:{self.client.get_file_name()} ")
+                if ALL_CONFIG["PATH"].get("save_audio", False):
+                    await save_audio_to_file(
+                        audio_data=audio.pcm,
+                        file_name=self.client.get_file_name(),
+                        sampling_rate=audio.sampling_rate,
+                    )
+                    logger.info(f"reference audio file:{self.client.get_file_name()} ")
                 logger.info(f"time taken for {self.client.asr_engine} ASR : {end - start}")
                 logger.info("{}_{} : {}".format(self.client.contact_id, self.client.channel,transcription.get("text")))
                 
@@ -158,16 +220,58 @@ class SilenceAtEndOfChunk(BufferingStrategyInterface):
                     self.client.user_speaking = False
                     await websocket.send_json({"type":"user_transcript","text":str(self.client.user_input_txt)})
                     
-                    asyncio.create_task(send_dm_response_with_tts(self.client, websocket))
-                    
-                    self.client.scratch_buffer.clear()
+                    # The task inherits the current trace and ends it once
+                    # the response audio has been sent.
+                    self.client.start_turn(send_dm_response_with_tts(self.client, websocket))
+                    trace = None
+
+                    self.clear_scratch_buffer(vad_pipeline)
                 
                 if self.client.service=="asr":
                     
                     await websocket.send_json(transcription)
                     
                 
-            self.client.scratch_buffer.clear()
+            self.clear_scratch_buffer(vad_pipeline)
             self.client.increment_file_counter()
+            if trace is not None:
+                trace.end()
 
         self.processing_flag = False
+
+    async def barge_in(self, websocket, vad_results):
+        """
+        Cancel the turn being answered once the user has spoken for
+        ``BARGE_IN.min_speech_seconds``: the dialogue manager, TTS and the
+        audio still being sent stop, and the client is told to drop what it
+        has buffered with a {"type": "control", "action": "barge_in"}
+        message. The new utterance is then handled as the next turn.
+
+        Args:
+            websocket (Websocket): The client's WebSocket connection.
+            vad_results (list): Speech segments found in the utterance.
+        """
+        turn = self.client.turn
+        if not BARGE_IN_SETTINGS["enabled"] or turn is None or not turn.active:
+            return
+
+        speech_seconds = sum(segment["end"] - segment["start"] for segment in vad_results)
+        if speech_seconds < BARGE_IN_SETTINGS["min_speech_seconds"]:
+            return
+
+        if self.client.cancel_turn():
+            BARGE_INS.inc()
+            logger.info(f"Barge-in from {self.client.client_id} after {speech_seconds:.2f}s of speech")
+            self.client.user_input_txt = ""
+            self.client.user_speaking = True
+            await websocket.send_json({"type":"control","action":"barge_in","session_id":self.client.session_id})
+
+    def clear_scratch_buffer(self, vad_pipeline):
+        """
+        Drop the current utterance and any VAD state built up for it.
+
+        Args:
+            vad_pipeline: The voice activity detection pipeline.
+        """
+        self.client.scratch_buffer.clear()
+        vad_pipeline.reset(self.client)
@@ -0,0 +1,108 @@
+import math
+from typing import Any, Dict, List
+
+from .config import ALL_CONFIG
+
+# Overridable through the "CHAT_HISTORY" section of the config.
+DEFAULT_CHAT_HISTORY_SETTINGS: Dict[str, Any] = {
+    "max_tokens": 1500,
+    "summarize": False,
+    "summary_max_tokens": 150,
+}
+
+# Per-message overhead of the chat format (role, separators).
+_MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of ``text`` (about four characters per token)."""
+    return math.ceil(len(text) / 4) + _MESSAGE_OVERHEAD
+
+
+class ChatHistory:
+    """
+    The messages sent to the chat model for one session.
+
+    The instructions are kept once as the system message, followed by the
+    most recent turns that fit in ``max_tokens``. Older turns drop out of
+    the window; with ``summarize`` they are kept aside until folded into a
+    running summary (see ``take_evicted`` and ``set_summary``), which is
+    sent as a second system message. The prompt size is therefore bounded
+    however long the call goes on.
+
+    Attributes:
+        system_prompt (str): Instructions sent with every request.
+        max_tokens (int): Budget for the windowed turns.
+        summarize (bool): Keep evicted turns for summarization.
+        summary_max_tokens (int): Length limit of the generated summary.
+        summary (str): Summary of the turns that left the window.
+        summary_task (asyncio.Task | None): Summarization in progress.
+    """
+
+    def __init__(self, system_prompt: str, max_tokens=1500, summarize=False, summary_max_tokens=150):
+        self.system_prompt = system_prompt
+        self.max_tokens = int(max_tokens)
+        self.summarize = bool(summarize)
+        self.summary_max_tokens = int(summary_max_tokens)
+        self.summary = ""
+        self.summary_task = None
+        self._turns: List[Dict[str, str]] = []
+        self._tokens = 0
+        self._evicted: List[Dict[str, str]] = []
+
+    @classmethod
+    def from_config(cls, system_prompt: str) -> "ChatHistory":
+        settings = dict(DEFAULT_CHAT_HISTORY_SETTINGS)
+        settings.update(ALL_CONFIG.get("CHAT_HISTORY", {}) or {})
+        return cls(
+            system_prompt,
+            settings["max_tokens"],
+            settings["summarize"],
+            settings["summary_max_tokens"],
+        )
+
+    def __len__(self):
+        return len(self._turns)
+
+    @property
+    def tokens(self) -> int:
+        return self._tokens
+
+    def add_user(self, text: str):
+        self._append("user", text)
+
+    def add_assistant(self, text: str):
+        self._append("assistant", text)
+
+    def messages(self) -> List[Dict[str, str]]:
+        messages = [{"role": "system", "content": self.system_prompt}]
+        if self.summary:
+            messages.append(
+                {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+            )
+        messages.extend(self._turns)
+        return messages
+
+    def take_evicted(self) -> List[Dict[str, str]]:
+        """Return and forget the turns that left the window since the last call."""
+        evicted, self._evicted = self._evicted, []
+        return evicted
+
+    def set_summary(self, summary: str):
+        self.summary = summary.strip()
+
+    def _append(self, role: str, text: str):
+        self._turns.append({"role": role, "content": text})
+        self._tokens += estimate_tokens(text)
+        self._trim()
+
+    def _trim(self):
+        # The latest message always stays, even if it alone is over budget,
+        # and the window never starts with an assistant reply.
+        while len(self._turns) > 1 and (
+            self._tokens > self.max_tokens or self._turns[0]["role"] == "assistant"
+        ):
+            turn = self._turns.pop(0)
+            self._tokens -= estimate_tokens(turn["content"])
+            if self.summarize:
+                self._evicted.append(turn)
@@ -5,9 +5,11 @@ import json
 import requests
 
 from src.asr.asr_factory import ASRFactory
+from src.audio_buffer import SegmentedAudioBuffer
 from src.buffering_strategy.buffering_strategy_factory import (
     BufferingStrategyFactory,
 )
+from src.turn_tasks import Turn
 
 class Client:
     """
@@ -19,7 +21,13 @@ class Client:
 
     Attributes:
         client_id (str): A unique identifier for the client.
-        buffer (bytearray): A buffer to store incoming audio data.
+        buffer (SegmentedAudioBuffer): A ring buffer to store incoming audio
+                                       data.
+        scratch_buffer (SegmentedAudioBuffer): The utterance currently being
+                                               analyzed by VAD/ASR.
+        max_utterance_seconds (float): Utterance length after which the
+                                       scratch buffer is flushed to ASR
+                                       regardless of VAD.
         config (dict): Configuration settings for the client, like chunk length
                        and offset.
         file_counter (int): Counter for the number of audio files processed.
@@ -27,6 +35,7 @@ class Client:
                              client.
         sampling_rate (int): The sampling rate of the audio data in Hz.
         samples_width (int): The width of each audio sample in bits.
+        turn (Turn): The s2s turn currently being answered, if any.
     """
 
     def __init__(self, client_id, sampling_rate, samples_width):
@@ -35,13 +44,20 @@ class Client:
         self.session_id = ""
         self.amelia_token = ""
         self.auth_config = {}
-        self.buffer = bytearray()
-        self.scratch_buffer = bytearray()
+        self.auto_script_task = None
+        self.buffer = SegmentedAudioBuffer(ring=True)
+        self.scratch_buffer = SegmentedAudioBuffer()
+        self.vad_state = None
+        self.noise_floor = None
+        self.trace = None
+        self.turn = None
         self.contact_id = None
         self.channel = None
         self.asr_engine = "riva"
         self.nlp_engine = "chatgpt"
         self.nlp_engine_config = {}
+        self.llm_streaming = False
+        self.tts_streaming = False
         self.user_speaking = True
         self.user_input_txt = ""
         self.extracted_entity_dict = {}
@@ -49,12 +65,14 @@ class Client:
         self.received_initial_config = False
         self.chunk_length_seconds = 1.8
         self.chunk_offset_seconds = 0.6
+        self.max_utterance_seconds = 30
         ist = pytz.timezone('Asia/Kolkata')
         current_time = datetime.now(ist)
-        self.file_counter = current_time.strftime("%Y%m%d_%H%M%S")
+        self.file_counter = current_time.strftime("%Y%m%d_%H%M%S_%f")
         self.total_samples = 0
         self.sampling_rate = sampling_rate
         self.samples_width = samples_width
+        self.update_buffer_limits()
         self.asr_pipeline_riva = ASRFactory.create_asr_pipeline("riva_asr")
         self.config = {
             "language": None,
@@ -77,6 +95,8 @@ class Client:
         self.nlp_engine = kwargs.get("nlpEngine", self.nlp_engine)
         self.tts_engine = kwargs.get("ttsEngine",self.asr_engine)
         self.nlp_engine_config = kwargs.get("nlpEngine_config",self.nlp_engine_config)
+        self.llm_streaming = kwargs.get("llmStreaming", self.llm_streaming)
+        self.tts_streaming = kwargs.get("ttsStreaming", self.tts_streaming)
         self.tts_voice = kwargs.get("ttsVoice")
         self.tts_emotion_detection = kwargs.get("tts_emotion_detection", False)
         self.sampling_rate = kwargs.get("sampling_rate", self.sampling_rate) 
@@ -105,8 +125,23 @@ class Client:
         if self.channel in ["CUSTOMER", "AGENT"]:
             self.sampling_rate = 8000 
 
+        self.max_utterance_seconds = kwargs.get("max_utterance_seconds", self.max_utterance_seconds)
+        self.update_buffer_limits()
+
+    def update_buffer_limits(self):
+        """
+        Caps the scratch buffer at max_utterance_seconds, and the incoming
+        ring buffer at the same size, so a session's audio memory is bounded
+        whatever VAD decides.
+        """
+        max_bytes = int(
+            self.max_utterance_seconds * self.sampling_rate * self.samples_width
+        )
+        self.scratch_buffer.max_bytes = max_bytes
+        self.buffer.max_bytes = max_bytes
+
     def append_audio_data(self, audio_data):
-        self.buffer.extend(audio_data)
+        self.buffer.append(audio_data)
         self.total_samples += len(audio_data) / self.samples_width
 
     def clear_buffer(self):
@@ -116,8 +151,8 @@ class Client:
         # self.file_counter += 1
         ist = pytz.timezone('Asia/Kolkata')
         current_time = datetime.now(ist)
-        # Format the timestamp as YYYYMMDD_HHMMSS
-        self.file_counter = current_time.strftime("%Y%m%d_%H%M%S")
+        # Format the timestamp as YYYYMMDD_HHMMSS_ffffff
+        self.file_counter = current_time.strftime("%Y%m%d_%H%M%S_%f")
 
     def get_file_name(self):
         if self.contact_id:
@@ -125,6 +160,16 @@ class Client:
         else:
             return f"{self.client_id}_{self.channel}_{self.file_counter}.wav"
 
+    def start_turn(self, coro):
+        """Answer ``coro`` as the current turn, cancelling the previous one."""
+        self.cancel_turn()
+        self.turn = Turn(coro, self.user_input_txt)
+        return self.turn
+
+    def cancel_turn(self):
+        """Cancel the turn in progress; returns whether there was one."""
+        return self.turn is not None and self.turn.cancel()
+
     def process_audio(self, websocket, vad_pipeline, asr_pipeline):
         self.buffering_strategy.process_audio(
             websocket, vad_pipeline, asr_pipeline
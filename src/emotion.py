@@ -0,0 +1,98 @@
+import asyncio
+import re
+from typing import Optional
+
+from .azure_openai_prompt import classify_emotion_async
+from .config import ALL_CONFIG
+from src.utils.logger import get_logger
+from src.utils.tracing import span
+from src.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+
+# Tone of the spoken reply for each detected user emotion: the reply is
+# meant to calm an angry or fearful caller, not mirror them.
+REPLY_STYLES = {
+    "calm": "Calm",
+    "neutral": "Neutral",
+    "happy": "Happy",
+    "angry": "Calm",
+    "fearful": "Calm",
+    "sad": "Calm",
+}
+
+# Styles the Riva English-US male voice exists in.
+_MALE_STYLES = {"Calm", "Neutral", "Happy", "Angry"}
+
+_emotion_cache_config = ALL_CONFIG.get("CACHE", {}).get("emotion", {}) or {}
+_emotion_cache = TTLCache(
+    max_size=_emotion_cache_config.get("max_size", 1024),
+    ttl_seconds=_emotion_cache_config.get("ttl_seconds"),
+)
+
+
+def normalize_text(text: str) -> str:
+    """Cache key for ``text``: lower case, no punctuation, single spaces."""
+    return " ".join(re.sub(r"[^\w\s']", " ", str(text).lower()).split())
+
+
+async def detect_emotion(text: str) -> str:
+    """
+    The emotion of ``text`` (calm, neutral, happy, angry, fearful or sad),
+    memoized by normalized text. Falls back to "neutral" on errors.
+    """
+    key = normalize_text(text)
+    if not key:
+        return "neutral"
+
+    emotion = _emotion_cache.get(key)
+    if emotion is not None:
+        return emotion
+
+    try:
+        with span("emotion"):
+            emotion = await classify_emotion_async(text)
+    except Exception as e:
+        logger.error(f"Emotion detection failed, using neutral: {e}")
+        return "neutral"
+
+    if emotion not in REPLY_STYLES:
+        emotion = "neutral"
+    _emotion_cache.set(key, emotion)
+    return emotion
+
+
+def start_emotion_detection(client) -> Optional["asyncio.Task"]:
+    """
+    Start classifying the user's input in the background, so the voice is
+    known by the time the reply is ready for TTS. Only Riva has emotion
+    voices; None when detection is off or not applicable.
+    """
+    if not client.tts_emotion_detection or client.tts_engine != "riva":
+        return None
+    if not normalize_text(client.user_input_txt):
+        return None
+    return asyncio.ensure_future(detect_emotion(client.user_input_txt))
+
+
+def voice_for_emotion(voice: Optional[str], emotion: str) -> Optional[str]:
+    """
+    The variant of Riva ``voice`` styled for replying to ``emotion``, e.g.
+    ("English-US.Female-1", "angry") -> "English-US.Female-Calm". Voices
+    without that style are returned unchanged.
+    """
+    style = REPLY_STYLES.get(emotion)
+    if not voice or not style:
+        return voice
+
+    if voice.startswith("English-US."):
+        base = voice.rsplit("-", 1)[0]
+        if base.endswith(".Male") and style not in _MALE_STYLES:
+            return voice
+        return f"{base}-{style}"
+
+    if voice.startswith("Magpie-Multilingual."):
+        return f"{voice.rsplit('.', 1)[0]}.{style}"
+
+    return voice
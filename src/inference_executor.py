@@ -0,0 +1,212 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from .config import ALL_CONFIG
+from src.utils.logger import get_logger
+from src.utils.tracing import span
+
+logger = get_logger(__name__)
+
+
+# Per-engine defaults, overridable through the "INFERENCE" section of the
+# config, e.g. INFERENCE: {whisper: {max_workers: 2, max_queue_size: 16}}.
+DEFAULT_EXECUTOR_SETTINGS: Dict[str, Any] = {
+    "kind": "thread",
+    "max_workers": 1,
+    "max_queue_size": 32,
+}
+
+DEFAULT_ENGINE_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "vad": {"max_workers": 2},
+    "whisper": {"max_workers": 1},
+    "riva": {"max_workers": 8},
+    "azure": {"max_workers": 8},
+    "google": {"max_workers": 8},
+    "itn": {"max_workers": 2},
+    "riva_tts": {"max_workers": 8},
+}
+
+
+class InferenceQueueFull(RuntimeError):
+    """Raised when an engine's bounded queue cannot accept more work."""
+
+
+class InferenceExecutor:
+    """
+    A bounded worker pool that runs blocking VAD/ASR calls off the event loop.
+
+    At most ``max_workers`` calls run at once; up to ``max_queue_size`` more
+    may wait for a free worker. Anything beyond that is rejected with
+    InferenceQueueFull so one overloaded engine cannot pile up unbounded work.
+
+    Thread pools are the default: torch, gRPC and the cloud SDKs release the
+    GIL while they work, and the engine objects stay shared in memory. Process
+    pools are only suitable for stateless, picklable callables.
+    """
+
+    def __init__(self, name, kind="thread", max_workers=1, max_queue_size=32):
+        self.name = name
+        self.kind = kind
+        self.max_workers = int(max_workers)
+        self.max_queue_size = int(max_queue_size)
+
+        if kind == "process":
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        elif kind == "thread":
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"inference-{name}",
+            )
+        else:
+            raise ValueError(f"Unknown inference executor kind: {kind}")
+
+        self._slots = None
+        self._waiting = 0
+        self._in_flight = 0
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._run_time_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+        Raises:
+            InferenceQueueFull: If the engine's wait queue is already full.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        if self._slots.locked() and self._waiting >= self.max_queue_size:
+            self._rejected += 1
+            raise InferenceQueueFull(
+                f"{self.name} inference queue is full "
+                f"({self._waiting} waiting, {self._in_flight} running)"
+            )
+
+        self._submitted += 1
+        submitted_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            with span(f"{self.name}.queue_wait"):
+                await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        wait_time = time.perf_counter() - submitted_at
+        self._wait_time_total += wait_time
+        self._wait_time_max = max(self._wait_time_max, wait_time)
+
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        self._in_flight += 1
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._in_flight -= 1
+            self._slots.release()
+            self._failed += 1
+            raise
+
+        # The worker slot is released when the call actually finishes, not
+        # when the awaiting coroutine goes away, so a cancelled caller cannot
+        # let more than max_workers calls run at once.
+        future.add_done_callback(
+            lambda f: loop.call_soon_threadsafe(self._on_done, f, started_at)
+        )
+        with span(f"{self.name}.compute"):
+            return await asyncio.wrap_future(future)
+
+    def _on_done(self, future, started_at):
+        self._in_flight -= 1
+        self._slots.release()
+        self._run_time_total += time.perf_counter() - started_at
+        if future.cancelled() or future.exception() is not None:
+            self._failed += 1
+        else:
+            self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        started = self._completed + self._failed
+        dequeued = self._submitted - self._waiting
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "wait_time_avg_s": (
+                self._wait_time_total / dequeued if dequeued else 0.0
+            ),
+            "wait_time_max_s": self._wait_time_max,
+            "run_time_avg_s": (
+                self._run_time_total / started if started else 0.0
+            ),
+        }
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait)
+
+
+_executors: Dict[str, InferenceExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _executor_settings(engine: str) -> Dict[str, Any]:
+    settings = dict(DEFAULT_EXECUTOR_SETTINGS)
+    settings.update(DEFAULT_ENGINE_SETTINGS.get(engine, {}))
+    settings.update(ALL_CONFIG.get("INFERENCE", {}).get(engine, {}) or {})
+    return settings
+
+
+def get_inference_executor(engine: str) -> InferenceExecutor:
+    """Return the process-wide executor for ``engine``, creating it once."""
+    executor = _executors.get(engine)
+    if executor is not None:
+        return executor
+
+    with _executors_lock:
+        executor = _executors.get(engine)
+        if executor is None:
+            settings = _executor_settings(engine)
+            executor = InferenceExecutor(engine, **settings)
+            _executors[engine] = executor
+            logger.info("Created %s inference executor: %s", engine, settings)
+    return executor
+
+
+async def run_inference(engine: str, fn: Callable, *args, **kwargs):
+    """Run a blocking inference call on the executor reserved for ``engine``."""
+    return await get_inference_executor(engine).run(fn, *args, **kwargs)
+
+
+def inference_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+
+def shutdown_inference_executors(wait=False):
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=wait)
+        _executors.clear()
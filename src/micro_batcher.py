@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List
+
+from .config import ALL_CONFIG
+from src.inference_executor import run_inference
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+DEFAULT_BATCHING_SETTINGS: Dict[str, Any] = {
+    "max_batch_size": 8,
+    "max_wait_ms": 20,
+}
+
+
+class MicroBatcher:
+    """
+    Collects requests from concurrent sessions into batches for one model.
+
+    The first request of a batch waits at most ``max_wait_ms`` for others to
+    join; the batch is then run as a single call of ``process_batch`` on the
+    inference executor of ``engine`` and each result is handed back to the
+    future of the request it belongs to. While a batch runs, new requests
+    queue up for the next one.
+
+    Attributes:
+        name (str): Name used in logs and stats.
+        process_batch (Callable): Blocking function mapping a list of inputs
+                                  to a list of results in the same order.
+        engine (str): Inference executor the batches run on.
+        max_batch_size (int): Largest batch handed to ``process_batch``.
+        max_wait_ms (float): Longest time a request waits for companions.
+    """
+
+    def __init__(self, name, process_batch: Callable[[List[Any]], List[Any]], engine=None, max_batch_size=8, max_wait_ms=20):
+        self.name = name
+        self.process_batch = process_batch
+        self.engine = engine or name
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = float(max_wait_ms)
+
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+        self._batches = 0
+        self._items = 0
+        self._max_seen_batch = 0
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, item):
+        """Queue ``item`` for the next batch and await its own result."""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Requests whose session went away are not worth computing.
+        return [(item, future) for item, future in batch if not future.done()]
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+
+            self._batches += 1
+            self._items += len(batch)
+            self._max_seen_batch = max(self._max_seen_batch, len(batch))
+
+            try:
+                results = list(await run_inference(
+                    self.engine, self.process_batch, [item for item, _ in batch]
+                ))
+                if len(results) != len(batch):
+                    # Results can no longer be matched to their requests.
+                    raise RuntimeError(
+                        f"process_batch returned {len(results)} results for {len(batch)} inputs"
+                    )
+            except Exception as e:
+                logger.error("%s batch of %d failed: %s", self.name, len(batch), e)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            "max_batch_size_seen": self._max_seen_batch,
+        }
+
+
+_batchers: Dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_micro_batcher(name, process_batch, engine=None) -> MicroBatcher:
+    """
+    Return the process-wide batcher ``name``, creating it once with the
+    settings from the "BATCHING" section of the config.
+    """
+    batcher = _batchers.get(name)
+    if batcher is not None:
+        return batcher
+
+    with _batchers_lock:
+        batcher = _batchers.get(name)
+        if batcher is None:
+            settings = dict(DEFAULT_BATCHING_SETTINGS)
+            settings.update(ALL_CONFIG.get("BATCHING", {}).get(name, {}) or {})
+            batcher = MicroBatcher(name, process_batch, engine=engine, **settings)
+            _batchers[name] = batcher
+            logger.info("Created %s micro-batcher: %s", name, settings)
+    return batcher
+
+
+def batching_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: batcher.stats() for name, batcher in _batchers.items()}
@@ -0,0 +1,81 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+from .config import ALL_CONFIG
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "dialogue_templates")
+
+
+class PayloadTemplate:
+    """
+    The static part of an agent request body, serialized once.
+
+    Every top-level field is kept as a ready-made ``"key": value`` JSON
+    fragment; rendering only serializes the per-turn fields (user_input,
+    session_id, history, ...) and joins the fragments, so the scenario text,
+    transcripts and customer details are never rebuilt or re-encoded.
+
+    Attributes:
+        name (str): Template name (the data file name without ``.json``).
+        fields (dict): The static fields, for reference only.
+    """
+
+    def __init__(self, name: str, fields: Dict[str, Any]):
+        self.name = name
+        self.fields = fields
+        self._fragments = {key: _fragment(key, value) for key, value in fields.items()}
+        self._static = ", ".join(self._fragments.values())
+
+    def render(self, **values) -> str:
+        """The JSON body with ``values`` added to (or replacing) the static fields."""
+        if any(key in self._fragments for key in values):
+            parts = [
+                fragment
+                for key, fragment in self._fragments.items()
+                if key not in values
+            ]
+        else:
+            parts = [self._static] if self._static else []
+        parts.extend(_fragment(key, value) for key, value in values.items())
+        return "{" + ", ".join(parts) + "}"
+
+    def render_with_overrides(self, overrides: Optional[Mapping[str, Any]], **values) -> str:
+        """
+        Like ``render``, with the template fields also present in
+        ``overrides`` (e.g. a client's ``nlp_engine_config``) replaced.
+        """
+        if overrides:
+            values = {
+                **{key: overrides[key] for key in self.fields if key in overrides},
+                **values,
+            }
+        return self.render(**values)
+
+
+def _fragment(key: str, value: Any) -> str:
+    return f"{json.dumps(key)}: {json.dumps(value)}"
+
+
+_templates: Dict[str, PayloadTemplate] = {}
+_templates_lock = threading.Lock()
+
+
+def get_payload_template(name: str) -> PayloadTemplate:
+    """
+    Return the template ``name``, loading ``<name>.json`` from the templates
+    directory (``PATH.dialogue_templates`` or src/dialogue_templates) once.
+    """
+    template = _templates.get(name)
+    if template is not None:
+        return template
+
+    with _templates_lock:
+        template = _templates.get(name)
+        if template is None:
+            templates_dir = ALL_CONFIG.get("PATH", {}).get("dialogue_templates") or TEMPLATES_DIR
+            with open(os.path.join(templates_dir, f"{name}.json"), "r", encoding="utf-8") as fh:
+                template = PayloadTemplate(name, json.load(fh))
+            _templates[name] = template
+    return template
@@ -1,60 +1,362 @@
+import asyncio
 import logging
 import time
 import json
 import os
+import uuid
 from .config import ALL_CONFIG
-from src.dialogue_management import dialogue_manager
+from src.agent_registry import agent_registry
+from src.dialogue_management import FALLBACK_EMPTY_REPLY, FALLBACK_REPLY, dialogue_manager
+from src.emotion import start_emotion_detection, voice_for_emotion
 from src.tts_manager import save_tts_to_file
+from src.tts.pcm_stream import send_pcm_stream, stream_settings
+from src.tts.phrase_cache import get_tts_phrase_cache, pcm_to_wav, tts_cache_key
+from src.tts.pipeline import synthesize_in_order
+from src.tts.riva_streaming_tts import stream_riva_tts
+from src.utils.metrics import DM_LATENCY, TTS_FIRST_AUDIO_LATENCY, TTS_LATENCY, label_value, track_latency
+from src.utils.sentence_splitter import split_sentences
+from src.utils.tracing import current_trace, span, start_trace
 
 
 from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
+AUDIO_CHUNK_BYTES = 1024
+
+# Client defaults (see Client.update_client_details).
+DEFAULT_PREWARM_VOICES = [{"engine": "riva", "voice": "English-US.Female-1"}]
+
+
+async def _tts_voice(client, emotion_task):
+    """The TTS voice, styled by the emotion detected alongside the DM call."""
+    if emotion_task is None:
+        return None
+    emotion = await emotion_task
+    voice = voice_for_emotion(client.tts_voice, emotion)
+    logger.info(f"detected emotion is: {emotion}, voice chosen: {voice}")
+    return voice
+
+
+async def _timed_first_chunk(client, chunks):
+    start_time = time.perf_counter()
+    first = True
+    async for chunk in chunks:
+        if first:
+            TTS_FIRST_AUDIO_LATENCY.labels(
+                tts_engine=label_value("tts_engine", client.tts_engine)
+            ).observe(time.perf_counter() - start_time)
+            first = False
+        yield chunk
+
+
+def _riva_stream(text, voice, settings):
+    return stream_riva_tts(
+        str(text),
+        voice,
+        settings["sample_rate_hz"],
+        settings["language_code"],
+        uri=settings["uri"] or ALL_CONFIG["Urls"]["riva"],
+    )
+
+
+async def _stream_tts_audio(client, websocket, text, voice=None, cacheable=False):
+    """
+    Stream ``text`` from Riva straight to the websocket as one start/bytes/end
+    audio clip: PCM frames are sent as they are synthesized, behind a
+    streaming WAV header, with no file in between. Phrases already in the
+    TTS cache are sent from there; only ``cacheable`` (fixed) phrases go
+    into it beyond ``TTS_CACHE.cache_replies``. The ``end`` message is sent even if the
+    stream fails or is cancelled, marked ``interrupted`` then.
+    """
+    settings = stream_settings()
+    voice = voice or client.tts_voice
+    cache = get_tts_phrase_cache()
+    key = tts_cache_key(client.tts_engine, voice, None, settings["sample_rate_hz"], text)
+    if cache is not None:
+        audio = await cache.get(key)
+        if audio is not None:
+            await _send_audio_clip(websocket, audio)
+            return
+
+    await websocket.send_json({"type":"config","audio_bytes_status":"start","audio_format":"wav_stream","sample_rate":settings["sample_rate_hz"]})
+
+    logger.info(f"tts response string is: {text}")
+
+    pcm = bytearray()
+
+    async def collected(chunks):
+        async for chunk in chunks:
+            pcm.extend(chunk)
+            yield chunk
+
+    chunks = _riva_stream(text, voice, settings)
+    complete = False
+    try:
+        with span("tts", tts_engine=client.tts_engine, streaming=True):
+            await send_pcm_stream(
+                websocket,
+                collected(_timed_first_chunk(client, chunks)),
+                settings["sample_rate_hz"],
+                frame_ms=settings["frame_ms"],
+                realtime_pacing=settings["realtime_pacing"],
+                prebuffer_ms=settings["prebuffer_ms"],
+            )
+        complete = True
+    finally:
+        await chunks.aclose()
+        end = {"type":"config","audio_bytes_status":"end"}
+        if not complete:
+            end["interrupted"] = True
+        try:
+            await websocket.send_json(end)
+        except Exception as e:
+            logger.warning(f"Could not close the streamed audio clip {e}")
+
+    if cache is not None and pcm:
+        await cache.set(key, pcm_to_wav(bytes(pcm), settings["sample_rate_hz"]), cacheable)
+
+
+async def _synthesize_audio(text, tts_engine, voice, tts_emotion_detection=False, file_prefix="tts"):
+    """
+    Synthesize ``text`` with ``tts_engine`` and return the audio file's bytes.
+    """
+    # Unique per call: sentences and turns of the same client overlap.
+    output_file = f"{file_prefix}_tts_{uuid.uuid4().hex}.wav"
+
+    start_time = time.time()
+
+    logger.info(f"tts response string is: {text}")
+
+    try:
+        with track_latency(TTS_LATENCY, "tts", tts_engine=tts_engine), span(
+            "tts", tts_engine=tts_engine
+        ):
+            await save_tts_to_file(text= str(text), output_file= output_file,tts_engine=tts_engine, tts_emotion_detection=tts_emotion_detection, voice = voice)
+
+        end_time = time.time()
+
+        logger.info(f"Time taken by {tts_engine} TTS : {end_time-start_time} seconds")
+
+        with open(output_file, 'rb') as f:
+            return f.read()
+    finally:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+
+async def _tts_audio(text, tts_engine, voice, tts_emotion_detection=False, file_prefix="tts", cacheable=False):
+    """
+    ``_synthesize_audio`` behind the TTS phrase cache. Only ``cacheable``
+    phrases are stored on disk; see ``TTSPhraseCache``.
+    """
+    cache = get_tts_phrase_cache()
+    if cache is None:
+        return await _synthesize_audio(text, tts_engine, voice, tts_emotion_detection, file_prefix)
+
+    # With engine-side emotion detection the style depends on the text alone.
+    emotion = "auto" if tts_emotion_detection else None
+    key = tts_cache_key(tts_engine, voice, emotion, None, text)
+    audio = await cache.get(key)
+    if audio is None:
+        audio = await _synthesize_audio(text, tts_engine, voice, tts_emotion_detection, file_prefix)
+        await cache.set(key, audio, cacheable)
+    return audio
+
+
+async def _collect_streamed_audio(text, voice):
+    settings = stream_settings()
+    pcm = bytearray()
+    async for chunk in _riva_stream(text, voice, settings):
+        pcm.extend(chunk)
+    return pcm_to_wav(bytes(pcm), settings["sample_rate_hz"])
+
+
+async def prewarm_tts_cache():
+    """
+    Synthesize the fixed replies (the dialogue-manager fallbacks and
+    ``TTS_CACHE.prewarm.phrases``) into the TTS cache for every voice in
+    ``TTS_CACHE.prewarm.voices``, so they play without a TTS call.
+    """
+    cache = get_tts_phrase_cache()
+    if cache is None:
+        return
+
+    prewarm = ALL_CONFIG.get("TTS_CACHE", {}).get("prewarm", {}) or {}
+    voices = prewarm.get("voices", DEFAULT_PREWARM_VOICES)
+    phrases = [FALLBACK_REPLY, FALLBACK_EMPTY_REPLY, *prewarm.get("phrases", [])]
+
+    warmed = 0
+    for entry in voices:
+        engine, voice = entry["engine"], entry["voice"]
+        for phrase in phrases:
+            # Replies are spoken sentence by sentence, so that is what is cached.
+            for sentence in split_sentences(phrase):
+                try:
+                    if entry.get("streaming"):
+                        key = tts_cache_key(engine, voice, None, stream_settings()["sample_rate_hz"], sentence)
+                        if await cache.get(key) is None:
+                            await cache.set(key, await _collect_streamed_audio(sentence, voice), cacheable=True)
+                    else:
+                        await _tts_audio(sentence, engine, voice, cacheable=True)
+                    warmed += 1
+                except Exception as e:
+                    logger.warning(f"Could not prewarm TTS cache for {engine}/{voice}: {e}")
+                    break
+    logger.info(f"Prewarmed {warmed} TTS cache entries")
+
+
+async def _send_audio_clip(websocket, audio):
+    await websocket.send_json({"type":"config","audio_bytes_status":"start"})
+    for offset in range(0, len(audio), AUDIO_CHUNK_BYTES):
+        await websocket.send_bytes(audio[offset:offset + AUDIO_CHUNK_BYTES])
+    await websocket.send_json({"type":"config","audio_bytes_status":"end"})
+
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+async def _speak_sentences(client, websocket, sentences, voice_task, on_sentence=None, cacheable=False):
+    """
+    Speak ``sentences`` (an async iterable) in order, one start/bytes/end
+    clip per sentence, and return the sentences spoken.
+
+    Sentences are synthesized concurrently as they arrive and each clip is
+    sent as soon as it and all earlier ones are ready, so playback starts
+    after the first sentence. ``on_sentence`` is awaited just before a
+    sentence's audio is sent. ``cacheable`` marks fixed replies (the
+    fallbacks) for the TTS cache. Riva streaming TTS already starts playing
+    within one chunk, so there sentences are simply streamed one by one.
+    """
+    spoken = []
+    if client.tts_streaming and client.tts_engine == "riva":
+        async for sentence in sentences:
+            if on_sentence is not None:
+                await on_sentence(sentence)
+            await _stream_tts_audio(client, websocket, sentence, await asyncio.shield(voice_task), cacheable)
+            spoken.append(sentence)
+        return spoken
+
+    async def synthesize(sentence):
+        # Shielded: the voice is shared by every sentence of the turn.
+        voice = await asyncio.shield(voice_task)
+        # When the voice is given the emotion was already detected and the
+        # TTS engine is not asked to detect it again.
+        return await _tts_audio(
+            sentence,
+            client.tts_engine,
+            voice or client.tts_voice,
+            client.tts_emotion_detection and voice is None,
+            file_prefix=client.client_id,
+            cacheable=cacheable,
+        )
+
+    clips = synthesize_in_order(sentences, synthesize, client.tts_engine)
+    try:
+        async for sentence, audio in clips:
+            if on_sentence is not None:
+                await on_sentence(sentence)
+            await _send_audio_clip(websocket, audio)
+            spoken.append(sentence)
+    finally:
+        await clips.aclose()
+    return spoken
+
+
+async def _produce_sentences(client, queue):
+    try:
+        with track_latency(DM_LATENCY, "dialogue_manager", nlp_engine=client.nlp_engine), span(
+            "dialogue_manager", nlp_engine=client.nlp_engine, streaming=True
+        ):
+            async for sentence in agent_registry.stream(client.nlp_engine, client):
+                await queue.put(sentence)
+    except Exception as e:
+        logger.error(f"Error while streaming the {client.nlp_engine} response {e}")
+    finally:
+        await queue.put(None)
+
+
+async def _send_streamed_response_with_tts(client, websocket, trace, voice_task):
+    """
+    Speak the LLM reply sentence by sentence while it is still being
+    generated: the stream is read by a producer task and every completed
+    sentence is synthesized right away and sent with a partial transcript,
+    so the first audio starts after the first sentence instead of the
+    whole reply.
+    """
+    queue = asyncio.Queue()
+    producer = asyncio.ensure_future(_produce_sentences(client, queue))
+
+    async def generated_sentences():
+        while True:
+            sentence = await queue.get()
+            if sentence is None:
+                return
+            yield sentence
+
+    async def send_partial(sentence):
+        await websocket.send_json({"type":"server_transcript","text":sentence, "session_id":client.session_id, "partial":True})
+
+    try:
+        sentences = await _speak_sentences(client, websocket, generated_sentences(), voice_task, send_partial)
+
+        if not sentences:
+            # Nothing came back: answer with the regular fallback.
+            sentences = await _speak_sentences(client, websocket, _iterate(split_sentences(FALLBACK_REPLY)), voice_task, cacheable=True)
+
+        await websocket.send_json({"type":"server_transcript","text":" ".join(sentences), "session_id":client.session_id, "partial":False, "timings":trace.timings()})
+    finally:
+        if not producer.done():
+            producer.cancel()
+
 
 async def send_dm_response_with_tts(client, websocket):
+    # Spoken turns arrive with the trace of their utterance; typed ones
+    # start their own.
+    trace = current_trace() or start_trace(
+        "turn", client_id=client.client_id, session_id=client.session_id
+    )
+    # The voice only depends on the user's input, so it is worked out while
+    # the dialogue manager writes the reply.
+    emotion_task = start_emotion_detection(client)
+    voice_task = asyncio.ensure_future(_tts_voice(client, emotion_task))
     try:
+        if client.llm_streaming and agent_registry.streams(client.nlp_engine):
+            await _send_streamed_response_with_tts(client, websocket, trace, voice_task)
+            client.user_input_txt= ""
+            return
+
         start_time = time.time()
-        response = await dialogue_manager(client)
+        with track_latency(DM_LATENCY, "dialogue_manager", nlp_engine=client.nlp_engine), span(
+            "dialogue_manager", nlp_engine=client.nlp_engine
+        ):
+            response = await dialogue_manager(client)
         end_time = time.time()
 
         logger.info(f"Time taken by {client.nlp_engine} LLM : {end_time-start_time} seconds")
 
         if isinstance(response, dict):
+            response.setdefault("timings", trace.timings())
             await websocket.send_json(response)
             response = response["text"]
         elif isinstance(response, str):
-            await websocket.send_json({"type":"server_transcript","text":str(response), "session_id":client.session_id})
-            
-        
-        output_file = f"{client.client_id}_tts.wav"
-        await websocket.send_json({"type":"config","audio_bytes_status":"start"})
-        
-        
+            await websocket.send_json({"type":"server_transcript","text":str(response), "session_id":client.session_id, "timings":trace.timings()})
+
+
         if client.tts_response not in ["",None]:
             response = client.tts_response
-            
-        start_time = time.time()
-        
-        logger.info(f"tts response string is: {response}")
-        
-        await save_tts_to_file(text= str(response), output_file= output_file,tts_engine=client.tts_engine, tts_emotion_detection=client.tts_emotion_detection, voice = client.tts_voice)
-        
         client.tts_response = ""
-        
-        end_time = time.time()
 
-        logger.info(f"Time taken by {client.tts_engine} TTS : {end_time-start_time} seconds")
-        
-        with open(output_file, 'rb') as f:
-            while True:
-                data = f.read(1024)
-                if not data:
-                    break
-                await websocket.send_bytes(data)
-        await websocket.send_json({"type":"config","audio_bytes_status":"end"})
-        os.remove(output_file)
-        
+        fallback = response in (FALLBACK_REPLY, FALLBACK_EMPTY_REPLY)
+        await _speak_sentences(client, websocket, _iterate(split_sentences(str(response))), voice_task, cacheable=fallback)
+
         client.user_input_txt= ""
-        
+
     except Exception as e:
-        logger.error(f"Error in send_dm_response_with_tts {e}")
\ No newline at end of file
+        logger.error(f"Error in send_dm_response_with_tts {e}")
+    finally:
+        for task in (voice_task, emotion_task):
+            if task is not None and not task.done():
+                task.cancel()
+        trace.end()
@@ -1,13 +1,23 @@
+import asyncio
 import json
 import uuid
 from typing import Dict, Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from src.asr.riva_config_cache import get_riva_config_cache
+from src.agent_registry import agent_stats
 from src.client import Client
+from src.dialogue_management import prefetch_auto_script
+from src.inference_executor import inference_stats
+from src.micro_batcher import batching_stats
+from src.send_response_with_speech import prewarm_tts_cache
+from src.tts.phrase_cache import tts_cache_stats
+from src.utils.http_client import close_http_clients
+from src.utils.metrics import render_metrics, track_clients, track_stats
 from .config import ALL_CONFIG
 from src.utils.logger import get_logger
 
@@ -43,6 +53,12 @@ class Server:
         self.certfile = certfile
         self.keyfile = keyfile
         self.connected_clients: Dict[str, Client] = {}
+        track_clients(self.connected_clients)
+        track_stats("vad", self.vad_pipeline.stats, documentation="VAD gate counters.")
+        track_stats("inference", inference_stats, label="executor", documentation="Inference executor queues and run times.")
+        track_stats("batching", batching_stats, label="batcher", documentation="Micro-batcher batch counts and sizes.")
+        track_stats("agent", agent_stats, label="nlp_engine", documentation="Dialogue-manager agent calls, failures and latency.")
+        track_stats("tts_cache", tts_cache_stats, documentation="TTS phrase cache size, hits and misses.")
 
         self.word_boosting_dict: Dict[str, Dict[str, float]] = {}
 
@@ -78,6 +94,10 @@ class Server:
         except Exception as e:
             logger.exception("Error loading word boosting config: %s", e)
 
+        self.riva_config_cache = get_riva_config_cache()
+        for dmn, mapping in self.word_boosting_dict.items():
+            self.riva_config_cache.set_word_boosting(dmn, mapping)
+
         self.app = FastAPI(title="FastAPI + WebSocket ASR Server")
 
         self.app.add_middleware(
@@ -92,10 +112,13 @@ class Server:
         self.app.get("/current_custom_words")(self.get_word_boosting_dict)
         self.app.post("/delete_custom_words")(self.clear_word_boosting_dict)
         self.app.get("/domains")(self.get_domain_list)
+        self.app.get("/metrics")(self.get_metrics)
         self.app.get("/health")(self.health_check)
         self.app.get("/")(self.health_check)
 
         self.app.websocket("/")(self.handle_websocket)
+        self.app.add_event_handler("startup", self.start_tts_cache_prewarm)
+        self.app.add_event_handler("shutdown", close_http_clients)
 
     async def handle_audio(self, client, websocket):
         while True:
@@ -116,16 +139,13 @@ class Server:
                 if payload:
                     logger.info("received config : %s", str(payload))
                     client.update_client_details(kwargs=payload)
+                    prefetch_auto_script(client)
 
                     if client.asr_engine == "riva" and not client.received_initial_config:
                         dmn = getattr(client, "domain", None) or "global"
-                        word_boosting_dict = (
-                            self.word_boosting_dict.get(dmn)
-                            or self.word_boosting_dict.get("global", {})
-                        )
                         try:
                             client.asr_pipeline_riva.update_word_boosting(
-                                domain=dmn, word_boosting_dict=word_boosting_dict
+                                domain=dmn
                             )
                             client.received_initial_config = True
                             logger.info(
@@ -204,6 +224,10 @@ class Server:
         for k, v in word_boosting_dict.items():
             self.word_boosting_dict[dmn_key][k] = v
 
+        self.riva_config_cache.set_word_boosting(
+            dmn_key, self.word_boosting_dict[dmn_key]
+        )
+
         logger.info(
             "Updated boosting dict for domain %s with %d entries",
             dmn_key,
@@ -221,6 +245,7 @@ class Server:
     async def clear_word_boosting_dict(self, domain: Optional[str] = None):
         dmn_key = domain or "global"
         self.word_boosting_dict.pop(dmn_key, None)
+        self.riva_config_cache.set_word_boosting(dmn_key, None)
 
         logger.info("Cleared boosting dict for %s", dmn_key)
         return JSONResponse(content={"status": "ok"}, status_code=200)
@@ -231,6 +256,14 @@ class Server:
             status_code=200,
         )
 
+    async def start_tts_cache_prewarm(self):
+        # In the background: the server must not wait on TTS to start.
+        self.tts_prewarm_task = asyncio.ensure_future(prewarm_tts_cache())
+
+    async def get_metrics(self):
+        data, content_type = render_metrics()
+        return Response(content=data, media_type=content_type)
+
     async def health_check(self):
         return {"status": "ok"}
 
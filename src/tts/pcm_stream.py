@@ -0,0 +1,85 @@
+import asyncio
+import struct
+import time
+from typing import Any, AsyncIterable, Dict
+
+from ..config import ALL_CONFIG
+
+# Overridable through TTS.streaming in the config.
+DEFAULT_STREAM_SETTINGS: Dict[str, Any] = {
+    "sample_rate_hz": 16000,
+    "language_code": "en-US",
+    "frame_ms": 100,
+    "realtime_pacing": True,
+    "prebuffer_ms": 300,
+    # Riva server used for synthesis; None falls back to Urls.riva.
+    "uri": None,
+}
+
+SAMPLE_WIDTH = 2
+
+
+def stream_settings() -> Dict[str, Any]:
+    settings = dict(DEFAULT_STREAM_SETTINGS)
+    settings.update(ALL_CONFIG.get("TTS", {}).get("streaming", {}) or {})
+    return settings
+
+
+def streaming_wav_header(sample_rate_hz: int, channels: int = 1) -> bytes:
+    """
+    A WAV header for 16-bit PCM of unknown length (sizes set to the
+    maximum), so clients that expect a .wav can play the stream as is.
+    """
+    byte_rate = sample_rate_hz * channels * SAMPLE_WIDTH
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate_hz, byte_rate, channels * SAMPLE_WIDTH, 8 * SAMPLE_WIDTH)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+async def send_pcm_stream(
+    websocket,
+    chunks: AsyncIterable[bytes],
+    sample_rate_hz: int,
+    frame_ms: int = 100,
+    realtime_pacing: bool = True,
+    prebuffer_ms: int = 300,
+) -> int:
+    """
+    Send PCM ``chunks`` to ``websocket`` in frames of ``frame_ms`` audio as
+    they arrive, preceded by a streaming WAV header. With
+    ``realtime_pacing`` frames are sent no faster than playback, keeping
+    ``prebuffer_ms`` of audio ahead of the client, so a turn that gets
+    interrupted has not already flooded the client's buffer.
+
+    Returns the number of PCM bytes sent.
+    """
+    bytes_per_ms = sample_rate_hz * SAMPLE_WIDTH / 1000
+    frame_bytes = max(SAMPLE_WIDTH, int(frame_ms * bytes_per_ms) // SAMPLE_WIDTH * SAMPLE_WIDTH)
+
+    await websocket.send_bytes(streaming_wav_header(sample_rate_hz))
+
+    sent = 0
+    started_at = None
+    pending = bytearray()
+
+    async def send(frame):
+        nonlocal sent, started_at
+        if started_at is None:
+            started_at = time.perf_counter()
+        if realtime_pacing:
+            ahead_ms = sent / bytes_per_ms - (time.perf_counter() - started_at) * 1000
+            if ahead_ms > prebuffer_ms:
+                await asyncio.sleep((ahead_ms - prebuffer_ms) / 1000)
+        await websocket.send_bytes(bytes(frame))
+        sent += len(frame)
+
+    async for chunk in chunks:
+        pending.extend(chunk)
+        while len(pending) >= frame_bytes:
+            await send(pending[:frame_bytes])
+            del pending[:frame_bytes]
+    if pending:
+        await send(pending)
+    return sent
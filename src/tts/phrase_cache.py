@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import io
+import os
+import threading
+import wave
+from typing import Any, Dict, Optional
+
+from ..config import ALL_CONFIG
+from src.utils.logger import get_logger
+from src.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+
+# Overridable through the "TTS_CACHE" section of the config.
+DEFAULT_TTS_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "memory_max_items": 256,
+    "disk_dir": "tts_cache",
+    "disk_max_bytes": 200 * 1024 * 1024,
+    # Also keep dynamic replies, in memory only: they can hold personal data.
+    "cache_replies": False,
+}
+
+
+def tts_cache_key(engine, voice, emotion, sample_rate_hz, text) -> str:
+    """Content address of one synthesized phrase."""
+    normalized = " ".join(str(text).split())
+    material = "\x1f".join(
+        str(part) for part in (engine, voice, emotion, sample_rate_hz, normalized)
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def pcm_to_wav(pcm: bytes, sample_rate_hz: int, sample_width: int = 2) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(sample_width)
+        out.setframerate(sample_rate_hz)
+        out.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class TTSPhraseCache:
+    """
+    Synthesized audio (complete WAV files) by ``tts_cache_key``.
+
+    A memory tier holds the ``memory_max_items`` most recently used phrases.
+    Below it a disk tier keeps one ``<key>.wav`` per phrase under
+    ``disk_dir`` and, once ``disk_max_bytes`` is exceeded, drops the least
+    recently used files. The disk tier survives restarts. Disk access runs
+    in a worker thread.
+
+    Only cacheable phrases (fixed replies such as the fallbacks and the
+    prewarmed phrases) are stored in both tiers. Dynamic replies are kept
+    in memory only, and only with ``cache_replies``.
+
+    Attributes:
+        disk_dir (str | None): Directory of the disk tier; None disables it.
+        disk_max_bytes (int): Size the disk tier is trimmed back to.
+        cache_replies (bool): Whether dynamic replies are cached at all.
+    """
+
+    def __init__(self, memory_max_items=256, disk_dir="tts_cache", disk_max_bytes=200 * 1024 * 1024, cache_replies=False):
+        self._memory = TTLCache(max_size=memory_max_items, ttl_seconds=None)
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = int(disk_max_bytes)
+        self.cache_replies = bool(cache_replies)
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = 0
+
+        self._disk_hits = 0
+        self._misses = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_bytes = sum(
+                entry.stat().st_size for entry in os.scandir(self.disk_dir) if entry.is_file()
+            )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.wav")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            return audio
+
+        if self.disk_dir:
+            audio = await asyncio.to_thread(self._read_disk, key)
+            if audio is not None:
+                self._disk_hits += 1
+                self._memory.set(key, audio)
+                return audio
+
+        self._misses += 1
+        return None
+
+    async def set(self, key: str, audio: bytes, cacheable: bool = False):
+        if not cacheable:
+            if self.cache_replies:
+                self._memory.set(key, audio)
+            return
+
+        self._memory.set(key, audio)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, audio)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                audio = fh.read()
+            # The access time drives the LRU order of the disk tier.
+            os.utime(path)
+            return audio
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, audio: bytes):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write TTS cache file %s: %s", path, e)
+            return
+
+        with self._disk_lock:
+            self._disk_bytes += len(audio)
+            if self._disk_bytes > self.disk_max_bytes:
+                self._trim_disk()
+
+    def _trim_disk(self):
+        entries = sorted(
+            (entry for entry in os.scandir(self.disk_dir) if entry.name.endswith(".wav")),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+        # Trim to 90% so a full cache does not rescan on every write.
+        target = self.disk_max_bytes * 0.9
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                continue
+        self._disk_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self._memory.stats(),
+            "disk_dir": self.disk_dir,
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+            "cache_replies": self.cache_replies,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+        }
+
+
+_cache: Optional[TTSPhraseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_phrase_cache() -> Optional[TTSPhraseCache]:
+    """Return the process-wide phrase cache, or None when TTS_CACHE.enabled is off."""
+    global _cache
+    if _cache is not None:
+        return _cache
+
+    settings = dict(DEFAULT_TTS_CACHE_SETTINGS)
+    settings.update(ALL_CONFIG.get("TTS_CACHE", {}) or {})
+    if not settings["enabled"]:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSPhraseCache(
+                memory_max_items=settings["memory_max_items"],
+                disk_dir=settings["disk_dir"],
+                disk_max_bytes=settings["disk_max_bytes"],
+                cache_replies=settings["cache_replies"],
+            )
+    return _cache
+
+
+def tts_cache_stats() -> Dict[str, Any]:
+    cache = get_tts_phrase_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..config import ALL_CONFIG
+
+# Concurrent synthesis calls per TTS engine, across all sessions.
+# Overridable through TTS.max_parallel, e.g. TTS: {max_parallel: {riva: 8}}.
+DEFAULT_MAX_PARALLEL = 4
+# Sentences of one reply synthesized ahead of the one being delivered, so a
+# long reply cannot take every slot of the engine. TTS.lookahead overrides it.
+DEFAULT_LOOKAHEAD = 2
+
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+_END = object()
+
+
+def _engine_semaphore(engine: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(engine)
+    if semaphore is None:
+        limits = ALL_CONFIG.get("TTS", {}).get("max_parallel", {}) or {}
+        semaphore = asyncio.Semaphore(int(limits.get(engine, DEFAULT_MAX_PARALLEL)))
+        _semaphores[engine] = semaphore
+    return semaphore
+
+
+async def synthesize_in_order(
+    items: AsyncIterable[str],
+    synthesize: Callable[[str], Awaitable[Any]],
+    engine: str,
+    lookahead: Optional[int] = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Yield ``(item, await synthesize(item))`` for every item, in order.
+
+    Items are read as soon as they are available and synthesized
+    concurrently, at most ``lookahead`` items ahead of the one being
+    delivered and at most ``TTS.max_parallel[engine]`` at a time across the
+    process, so each result is usually ready by the time the previous one
+    has been delivered. A failed item raises when its turn comes; closing
+    the generator cancels whatever is still being synthesized.
+    """
+    semaphore = _engine_semaphore(engine)
+    if lookahead is None:
+        lookahead = int(ALL_CONFIG.get("TTS", {}).get("lookahead", DEFAULT_LOOKAHEAD))
+    window = asyncio.Semaphore(lookahead + 1)
+    tasks: asyncio.Queue = asyncio.Queue()
+    started = []
+
+    async def run(item):
+        async with semaphore:
+            return await synthesize(item)
+
+    async def feed():
+        try:
+            async for item in items:
+                await window.acquire()
+                task = asyncio.ensure_future(run(item))
+                started.append(task)
+                await tasks.put((item, task))
+        finally:
+            await tasks.put(_END)
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while True:
+            entry = await tasks.get()
+            if entry is _END:
+                break
+            item, task = entry
+            yield item, await task
+            window.release()
+        # Surface errors of the item source.
+        await feeder
+    finally:
+        for task in [feeder, *started]:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from typing import AsyncIterator
+
+import riva.client
+
+from ..asr.riva_channel_pool import get_riva_channel_pool
+from ..config import ALL_CONFIG
+from ..inference_executor import run_inference
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_END = object()
+
+
+async def stream_riva_tts(
+    text: str,
+    voice: str,
+    sample_rate_hz: int = 16000,
+    language_code: str = "en-US",
+    uri: str = f"{ALL_CONFIG['Urls']['riva']}",
+) -> AsyncIterator[bytes]:
+    """
+    Yield raw 16-bit PCM chunks of ``text`` as Riva synthesizes them.
+
+    ``synthesize_online`` is a blocking gRPC stream, so it is read on the
+    "riva_tts" inference executor (one worker per stream in progress) and
+    handed to the event loop chunk by chunk. Closing the generator early
+    cancels the gRPC call.
+    """
+    service = get_riva_channel_pool(uri).get_tts_service()
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce():
+        responses = service.synthesize_online(
+            text,
+            voice_name=voice,
+            language_code=language_code,
+            encoding=riva.client.AudioEncoding.LINEAR_PCM,
+            sample_rate_hz=sample_rate_hz,
+        )
+        try:
+            for response in responses:
+                if stop.is_set():
+                    responses.cancel()
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, response.audio)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _END)
+
+    def on_producer_done(task):
+        # The executor can refuse the stream (InferenceQueueFull) before
+        # produce() ever runs.
+        if not task.cancelled() and task.exception() is not None:
+            queue.put_nowait(task.exception())
+
+    producer = asyncio.ensure_future(run_inference("riva_tts", produce))
+    producer.add_done_callback(on_producer_done)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await producer
+    finally:
+        stop.set()
+        if not producer.done():
+            producer.cancel()
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Coroutine
+
+
+class Turn:
+    """
+    One s2s turn of a client: the task answering it (dialogue manager, TTS,
+    audio streaming), cancelled when the user barges in.
+
+    Everything the turn starts on the way (emotion detection, the LLM
+    stream producer, the sentence synthesis tasks) is owned by that task
+    and cancelled in its ``finally`` blocks, so cancelling the one task
+    stops the whole turn.
+
+    Attributes:
+        text (str): The user input the turn answers.
+        task (asyncio.Task): The task answering it.
+    """
+
+    def __init__(self, coro: Coroutine, text: str = ""):
+        self.text = text
+        self.task = asyncio.ensure_future(coro)
+
+    @property
+    def active(self) -> bool:
+        return not self.task.done()
+
+    def cancel(self) -> bool:
+        """Cancel the turn; returns whether it was still running."""
+        if self.task.done():
+            return False
+        self.task.cancel()
+        return True
@@ -0,0 +1,75 @@
+import importlib.util
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from .config import ALL_CONFIG
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# Overridable through the "HTTP" section of the config.
+DEFAULT_HTTP_SETTINGS: Dict[str, Any] = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+    "connect_timeout": 3.0,
+    "http2": True,
+}
+
+
+def _http_settings() -> Dict[str, Any]:
+    settings = dict(DEFAULT_HTTP_SETTINGS)
+    settings.update(ALL_CONFIG.get("HTTP", {}) or {})
+    return settings
+
+
+_clients: Dict[Tuple[bool, Optional[str]], httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(verify: bool = True, proxy: Optional[str] = None) -> httpx.AsyncClient:
+    """
+    Return the process-wide async HTTP client for ``verify`` and ``proxy``.
+
+    The client keeps a keep-alive connection pool per host and negotiates
+    HTTP/2 when the ``h2`` package is installed, so agent calls reuse warm
+    TCP/TLS connections instead of opening a new one per turn. TLS
+    verification and the proxy are properties of the pool, hence one client
+    per combination. The proxy is set on the transport, never through the
+    process environment.
+    """
+    key = (verify, proxy or None)
+    client = _clients.get(key)
+    if client is not None and not client.is_closed:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            settings = _http_settings()
+            http2 = bool(settings["http2"]) and importlib.util.find_spec("h2") is not None
+            client = httpx.AsyncClient(
+                http2=http2,
+                verify=verify,
+                proxy=proxy or None,
+                limits=httpx.Limits(
+                    max_connections=settings["max_connections"],
+                    max_keepalive_connections=settings["max_keepalive_connections"],
+                    keepalive_expiry=settings["keepalive_expiry"],
+                ),
+                timeout=httpx.Timeout(10.0, connect=settings["connect_timeout"]),
+            )
+            _clients[key] = client
+            logger.info(
+                "Created HTTP client (verify=%s, proxy=%s, http2=%s)", verify, bool(proxy), http2
+            )
+    return client
+
+
+async def close_http_clients():
+    for key in list(_clients):
+        client = _clients.pop(key)
+        await client.aclose()
@@ -0,0 +1,198 @@
+import re
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+# Speech pipeline stages run from tens of milliseconds (VAD) to several
+# seconds (LLM, long TTS), so the buckets span both ends.
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+VAD_LATENCY = Histogram(
+    "vad_latency_seconds",
+    "Voice activity detection latency per chunk.",
+    buckets=LATENCY_BUCKETS,
+)
+ASR_LATENCY = Histogram(
+    "asr_latency_seconds",
+    "Speech recognition latency per utterance.",
+    ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+ITN_LATENCY = Histogram(
+    "itn_latency_seconds",
+    "Inverse text normalization latency per transcript.",
+    buckets=LATENCY_BUCKETS,
+)
+DM_LATENCY = Histogram(
+    "dialogue_manager_latency_seconds",
+    "Dialogue manager latency per turn.",
+    ["nlp_engine"],
+    buckets=LATENCY_BUCKETS,
+)
+TTS_LATENCY = Histogram(
+    "tts_latency_seconds",
+    "Speech synthesis latency per response.",
+    ["tts_engine"],
+    buckets=LATENCY_BUCKETS,
+)
+
+TTS_FIRST_AUDIO_LATENCY = Histogram(
+    "tts_first_audio_seconds",
+    "Time from a streaming TTS request to its first audio chunk.",
+    ["tts_engine"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CONNECTED_CLIENTS = Gauge(
+    "connected_clients",
+    "Websocket clients currently connected.",
+)
+AUDIO_BUFFER_BYTES = Gauge(
+    "audio_buffer_bytes",
+    "Audio bytes buffered across all connected clients.",
+)
+IN_FLIGHT_TASKS = Gauge(
+    "in_flight_tasks",
+    "Pipeline calls currently running, per stage.",
+    ["stage"],
+)
+
+PROCESSING_OVERLAPS = Counter(
+    "chunk_processing_overlaps",
+    "New chunks that arrived while the previous one was still being processed.",
+)
+BARGE_INS = Counter(
+    "barge_ins",
+    "Turns cancelled because the user started speaking over the response.",
+)
+
+
+# Engine names come from the client's config message, so label values
+# outside these sets are recorded as "other" to keep the series bounded.
+# ``asrPipeline`` values and the ASR factory types:
+ASR_ENGINES = frozenset(
+    {"riva", "azure", "google", "whisper", "whisper_turbo", "riva_asr", "azure_asr", "google_asr"}
+)
+TTS_ENGINES = frozenset({"riva", "azure", "polly", "google"})
+OTHER_LABEL = "other"
+
+
+def _known_nlp_engine(value) -> bool:
+    # Imported here: the registry module must not depend on metrics.
+    from src.agent_registry import agent_registry
+
+    return agent_registry.get(value) is not None
+
+
+_KNOWN_LABEL_VALUES = {
+    "engine": ASR_ENGINES.__contains__,
+    "tts_engine": TTS_ENGINES.__contains__,
+    "nlp_engine": _known_nlp_engine,
+}
+
+
+def label_value(label: str, value) -> str:
+    """``value`` as a label value, or "other" if it is not a known name for ``label``."""
+    value = str(value)
+    known = _KNOWN_LABEL_VALUES.get(label)
+    if known is not None and not known(value):
+        return OTHER_LABEL
+    return value
+
+
+@contextmanager
+def track_latency(histogram, stage, **labels):
+    """
+    Observe the duration of the ``with`` block in ``histogram`` and count it
+    as an in-flight task of ``stage`` while it runs.
+    """
+    if labels:
+        histogram = histogram.labels(**{k: label_value(k, v) for k, v in labels.items()})
+    in_flight = IN_FLIGHT_TASKS.labels(stage=stage)
+
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start)
+        in_flight.dec()
+
+
+def track_clients(connected_clients):
+    """
+    Derive the client and buffer gauges from the server's client registry at
+    scrape time, so connects and disconnects need no bookkeeping.
+    """
+    CONNECTED_CLIENTS.set_function(lambda: len(connected_clients))
+    AUDIO_BUFFER_BYTES.set_function(
+        lambda: sum(
+            len(client.buffer) + len(client.scratch_buffer)
+            for client in list(connected_clients.values())
+        )
+    )
+
+
+class _StatsCollector:
+    """
+    Reads the registered ``stats()`` functions at scrape time and exposes
+    every numeric value as a gauge ``<prefix>_<key>``. Nested dicts are
+    flattened into the name; for per-name stats (name -> counters) the
+    name becomes the value of ``label``, passed through ``label_value``.
+    """
+
+    def __init__(self):
+        self.sources = {}
+
+    def collect(self):
+        families = {}
+        for prefix, (stats_fn, label, documentation) in list(self.sources.items()):
+            stats = stats_fn()
+            if label is None:
+                rows = [((), stats)]
+            else:
+                rows = [((label_value(label, name),), values) for name, values in stats.items()]
+            for label_values, values in rows:
+                for key, value in _numeric_items(values):
+                    name = f"{prefix}_{key}"
+                    family = families.get(name)
+                    if family is None:
+                        family = families[name] = GaugeMetricFamily(
+                            name, documentation, labels=[label] if label else None
+                        )
+                    family.add_metric(list(label_values), value)
+        return list(families.values())
+
+
+def _numeric_items(values, prefix=""):
+    for key, value in values.items():
+        key = re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}{key}")
+        if isinstance(value, dict):
+            yield from _numeric_items(value, f"{key}_")
+        elif isinstance(value, (int, float)):
+            yield key, float(value)
+
+
+_stats_collector = _StatsCollector()
+REGISTRY.register(_stats_collector)
+
+
+def track_stats(prefix, stats_fn, label=None, documentation=""):
+    """
+    Expose the counters returned by ``stats_fn`` on /metrics, read at scrape
+    time like the client gauges. With ``label`` the stats are keyed by name
+    (executor, agent, ...) and each name becomes that label's value.
+    Registering ``prefix`` again replaces its source.
+    """
+    _stats_collector.sources[prefix] = (
+        stats_fn,
+        label,
+        documentation or f"{prefix} statistics.",
+    )
+
+
+def render_metrics():
+    """The current metrics in the Prometheus text exposition format."""
+    return generate_latest(), CONTENT_TYPE_LATEST
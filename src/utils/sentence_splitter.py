@@ -0,0 +1,51 @@
+import re
+from typing import List
+
+# A sentence ends at ., ! or ? (plus closing quotes/brackets) followed by
+# whitespace, so decimals like "3.5" and URLs are not split.
+_BOUNDARY = re.compile(r"[.!?…]+[\"')\]]*\s+")
+
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "jr", "sr", "vs", "etc", "e.g", "i.e", "no"}
+
+
+class SentenceSplitter:
+    """
+    Cuts a stream of text deltas into complete sentences.
+
+    ``feed`` returns the sentences completed by a delta and keeps the rest
+    for later; ``flush`` returns whatever is left once the stream ends.
+    Sentences shorter than ``min_chars`` are joined to the next one so TTS is
+    not called for fragments like "Sure."
+
+    Attributes:
+        min_chars (int): Shortest sentence emitted before the stream ends.
+    """
+
+    def __init__(self, min_chars=20):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        self._buffer += delta
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            last_word = candidate.rstrip(".!?…\"')] ").rsplit(" ", 1)[-1].lower()
+            if last_word in _ABBREVIATIONS or len(candidate) < self.min_chars:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return [rest] if rest else []
+
+
+def split_sentences(text: str, min_chars=20) -> List[str]:
+    """Split a complete text into sentences, as ``SentenceSplitter`` would."""
+    splitter = SentenceSplitter(min_chars)
+    return splitter.feed(text + " ") + splitter.flush()
@@ -0,0 +1,237 @@
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .config import ALL_CONFIG
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("trace", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("span", default=None)
+
+
+def _new_id(num_bytes):
+    return os.urandom(num_bytes).hex()
+
+
+class Span:
+    """One timed stage of a trace."""
+
+    def __init__(self, trace_id, name, parent_id=None, attributes=None):
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Trace:
+    """
+    The spans of one utterance, from its first VAD pass to the last TTS byte.
+
+    A trace is made current with ``use_trace`` and then follows the code
+    through ``await`` and into tasks created from it, so stages deep in the
+    call chain only need ``span(...)`` to record themselves.
+    """
+
+    def __init__(self, name, **attributes):
+        self.trace_id = _new_id(16)
+        self.root = Span(self.trace_id, name, attributes=attributes)
+        self.spans: List[Span] = [self.root]
+        self.ended = False
+
+    def start_span(self, name, parent_id=None, **attributes) -> Span:
+        span = Span(self.trace_id, name, parent_id or self.root.span_id, attributes)
+        self.spans.append(span)
+        return span
+
+    def timings(self) -> Dict[str, float]:
+        """Compact breakdown: total milliseconds per span name."""
+        timings: Dict[str, float] = {}
+        for span in self.spans[1:]:
+            timings[span.name] = timings.get(span.name, 0.0) + span.duration_ms
+        timings["total"] = self.root.duration_ms
+        return {name: round(ms, 1) for name, ms in timings.items()}
+
+    def end(self):
+        """Close the trace and hand it to the exporter (only once)."""
+        if self.ended:
+            return
+        self.ended = True
+        self.root.end()
+        exporter = get_span_exporter()
+        if exporter is not None:
+            exporter.export(self)
+
+
+def start_trace(name, **attributes) -> Trace:
+    """Create a trace and make it current for this task."""
+    trace = Trace(name, **attributes)
+    use_trace(trace)
+    return trace
+
+
+def use_trace(trace: Optional[Trace]):
+    _current_trace.set(trace)
+    _current_span.set(None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Record the ``with`` block as a span of the current trace. Without a
+    current trace this does nothing.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = trace.start_span(
+        name, parent_id=parent.span_id if parent else None, **attributes
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
+
+
+class SpanExporter:
+    """
+    Writes finished traces as OTLP/JSON ``ExportTraceServiceRequest`` lines to
+    a file and/or POSTs them to an OTLP/HTTP collector, from a background
+    thread so the event loop never waits on disk or network.
+    """
+
+    def __init__(self, path=None, endpoint=None, service_name="voicestreamai"):
+        self.path = path
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="trace-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, trace: Trace):
+        self._queue.put(trace)
+
+    def to_otlp(self, trace: Trace) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": _otlp_value(self.service_name)}
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "src.utils.tracing"},
+                            "spans": [s.to_otlp() for s in trace.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _run(self):
+        while True:
+            trace = self._queue.get()
+            payload = self.to_otlp(trace)
+            try:
+                if self.path:
+                    with open(self.path, "a", encoding="utf-8") as fh:
+                        fh.write(json.dumps(payload) + "\n")
+                if self.endpoint:
+                    httpx.post(self.endpoint, json=payload, timeout=2.0)
+            except Exception as e:
+                logger.warning("Failed to export trace %s: %s", trace.trace_id, e)
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+_exporter_configured = False
+
+
+def get_span_exporter() -> Optional[SpanExporter]:
+    """
+    The process-wide exporter configured by the "TRACING" section
+    (``export_path`` and/or ``endpoint``), or None if neither is set.
+    """
+    global _exporter, _exporter_configured
+    if not _exporter_configured:
+        with _exporter_lock:
+            if not _exporter_configured:
+                tracing_config = ALL_CONFIG.get("TRACING", {}) or {}
+                path = tracing_config.get("export_path")
+                endpoint = tracing_config.get("endpoint")
+                if path or endpoint:
+                    if path and os.path.dirname(path):
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                    _exporter = SpanExporter(
+                        path=path,
+                        endpoint=endpoint,
+                        service_name=tracing_config.get("service_name", "voicestreamai"),
+                    )
+                _exporter_configured = True
+    return _exporter
@@ -0,0 +1,105 @@
+import numpy as np
+import torch
+
+
+class BatchedSegmentation:
+    """
+    Scores speech for many sessions with one segmentation-model forward pass.
+
+    Each session's samples are cut into fixed-size windows of the model's
+    training duration (the last one zero-padded); the windows of every
+    session in the batch are stacked into a single tensor, scored together,
+    and the frame scores are split back per session and binarized into
+    speech segments with the same onset/offset hysteresis and minimum
+    durations as pyannote's VoiceActivityDetection pipeline.
+
+    Instances are used as the ``process_batch`` callable of a MicroBatcher:
+    they take a list of float32 sample arrays and return one list of
+    segments (in seconds from the start of each array) per input.
+
+    Attributes:
+        model: The pyannote segmentation model.
+        onset (float): Score above which speech starts.
+        offset (float): Score below which speech ends.
+        min_duration_on (float): Shortest speech segment kept.
+        min_duration_off (float): Shortest pause that splits two segments.
+    """
+
+    def __init__(self, model, onset=0.5, offset=0.5, min_duration_on=0.0, min_duration_off=0.0):
+        self.model = model
+        self.model.eval()
+        self.onset = onset
+        self.offset = offset
+        self.min_duration_on = min_duration_on
+        self.min_duration_off = min_duration_off
+
+        specifications = model.specifications
+        if isinstance(specifications, tuple):
+            specifications = specifications[0]
+        self.window_seconds = specifications.duration
+        self.powerset = getattr(specifications, "powerset", False)
+        self.sample_rate = model.audio.sample_rate
+        self.device = next(model.parameters()).device
+
+    def __call__(self, batch):
+        window = int(self.window_seconds * self.sample_rate)
+
+        windows, windows_per_item = [], []
+        for samples in batch:
+            num_windows = max(1, -(-len(samples) // window))
+            padded = np.zeros(num_windows * window, dtype=np.float32)
+            padded[: len(samples)] = samples
+            windows.append(padded.reshape(num_windows, window))
+            windows_per_item.append(num_windows)
+
+        waveforms = torch.from_numpy(np.concatenate(windows)).unsqueeze(1)
+        with torch.inference_mode():
+            outputs = self.model(waveforms.to(self.device))
+        scores = self.speech_scores(outputs).cpu().numpy()
+
+        frame_seconds = self.window_seconds / scores.shape[1]
+        results, first = [], 0
+        for samples, num_windows in zip(batch, windows_per_item):
+            item_scores = scores[first : first + num_windows].reshape(-1)
+            first += num_windows
+            num_frames = int(np.ceil(len(samples) / self.sample_rate / frame_seconds))
+            results.append(self.binarize(item_scores[:num_frames], frame_seconds))
+        return results
+
+    def speech_scores(self, outputs):
+        """
+        Per-frame probability that anyone speaks, shape (windows, frames).
+        """
+        if self.powerset:
+            # Class 0 of a powerset model is "nobody speaks" (log-softmax).
+            return 1.0 - torch.exp(outputs[..., 0])
+        return outputs.max(dim=-1).values
+
+    def binarize(self, scores, frame_seconds):
+        """
+        Turns per-frame speech scores into segments in seconds.
+        """
+        segments = []
+        start = None
+        for index, score in enumerate(scores):
+            if start is None:
+                if score > self.onset:
+                    start = index * frame_seconds
+            elif score < self.offset:
+                segments.append([start, index * frame_seconds])
+                start = None
+        if start is not None:
+            segments.append([start, len(scores) * frame_seconds])
+
+        merged = []
+        for start, end in segments:
+            if merged and start - merged[-1][1] < self.min_duration_off:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        return [
+            {"start": float(start), "end": float(end), "confidence": 1.0}
+            for start, end in merged
+            if end - start >= self.min_duration_on
+        ]
@@ -0,0 +1,162 @@
+import numpy as np
+
+from src.audio_utils import AudioSegment
+
+from .vad_interface import VADInterface
+
+
+class EnergyVAD(VADInterface):
+    def __init__(self, **kwargs):
+        """
+        Initializes a lightweight VAD based on frame energy.
+
+        Every frame is scored with vectorized NumPy: RMS energy against an
+        adaptive per-client noise floor, plus the zero-crossing rate to tell
+        hiss and line noise from voiced speech.
+
+        Args:
+            frame_ms (int, optional): Frame length in milliseconds.
+            snr_ratio (float, optional): How far above the noise floor a
+                frame's RMS must be to count as speech.
+            min_rms (float, optional): Absolute RMS (full scale = 1.0) below
+                which a frame is always silence.
+            max_zcr (float, optional): Zero-crossing rate above which a
+                quiet frame is treated as noise rather than speech.
+            min_duration_on (float, optional): Shortest speech segment kept.
+            min_duration_off (float, optional): Shortest pause that splits
+                two speech segments.
+            noise_adapt_rate (float, optional): Weight of each new chunk when
+                updating the noise floor.
+        """
+        self.frame_ms = kwargs.get("frame_ms", 30)
+        self.snr_ratio = kwargs.get("snr_ratio", 3.0)
+        self.min_rms = kwargs.get("min_rms", 0.005)
+        self.max_zcr = kwargs.get("max_zcr", 0.35)
+        self.min_duration_on = kwargs.get("min_duration_on", 0.1)
+        self.min_duration_off = kwargs.get("min_duration_off", 0.3)
+        self.noise_adapt_rate = kwargs.get("noise_adapt_rate", 0.05)
+
+    def frame_features(self, audio):
+        """
+        Returns per-frame RMS and zero-crossing rate of ``audio``.
+        """
+        frame_length = max(1, int(audio.sampling_rate * self.frame_ms / 1000))
+        samples = audio.to_float32()
+        num_frames = len(samples) // frame_length
+        if num_frames == 0:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        frames = samples[: num_frames * frame_length].reshape(
+            num_frames, frame_length
+        )
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+        return rms, zcr
+
+    def speech_mask(self, client, audio):
+        """
+        Classifies every frame of ``audio`` and updates the client's noise
+        floor from the frames judged to be silence.
+        """
+        rms, zcr = self.frame_features(audio)
+        if len(rms) == 0:
+            return np.zeros(0, dtype=bool)
+
+        noise_floor = getattr(client, "noise_floor", None)
+        if noise_floor is None:
+            noise_floor = max(float(np.percentile(rms, 10)), self.min_rms / self.snr_ratio)
+
+        threshold = max(noise_floor * self.snr_ratio, self.min_rms)
+        loud = rms > threshold
+        # Quiet, noisy frames (high ZCR) are hiss; loud ones are fricatives.
+        noisy = (zcr > self.max_zcr) & (rms < 2 * threshold)
+        mask = loud & ~noisy
+
+        if (~mask).any():
+            chunk_floor = float(np.median(rms[~mask]))
+            noise_floor += self.noise_adapt_rate * (chunk_floor - noise_floor)
+        client.noise_floor = noise_floor
+
+        return mask
+
+    def is_silent(self, client, audio):
+        """
+        True when no frame of ``audio`` could plausibly be speech.
+        """
+        min_frames = max(1, int(self.min_duration_on * 1000 / self.frame_ms))
+        return int(self.speech_mask(client, audio).sum()) < min_frames
+
+    async def detect_activity(self, client, audio=None):
+        if audio is None:
+            audio = AudioSegment.from_client(client)
+
+        mask = self.speech_mask(client, audio)
+        if not mask.any():
+            return []
+
+        frame_seconds = self.frame_ms / 1000
+        # Boundaries of runs of speech frames.
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1) * frame_seconds
+        ends = np.flatnonzero(edges == -1) * frame_seconds
+
+        vad_segments = []
+        for start, end in zip(starts, ends):
+            if vad_segments and start - vad_segments[-1]["end"] < self.min_duration_off:
+                vad_segments[-1]["end"] = float(end)
+            else:
+                vad_segments.append(
+                    {"start": float(start), "end": float(end), "confidence": 1.0}
+                )
+
+        return [
+            segment
+            for segment in vad_segments
+            if segment["end"] - segment["start"] >= self.min_duration_on
+        ]
+
+
+class GatedVAD(VADInterface):
+    """
+    Runs a cheap VAD in front of an expensive one.
+
+    Audio the gate confidently marks as silent is discarded without invoking
+    the wrapped model; everything else is passed through unchanged.
+
+    Attributes:
+        gate (EnergyVAD): The cheap pre-VAD stage.
+        vad (VADInterface): The VAD used for audio that may contain speech.
+        gated_chunks (int): Chunks discarded by the gate.
+        passed_chunks (int): Chunks handed to the wrapped VAD.
+    """
+
+    def __init__(self, gate, vad):
+        self.gate = gate
+        self.vad = vad
+        self.gated_chunks = 0
+        self.passed_chunks = 0
+
+    async def detect_activity(self, client, audio=None):
+        if audio is None:
+            audio = AudioSegment.from_client(client)
+
+        if self.gate.is_silent(client, audio):
+            self.gated_chunks += 1
+            return []
+
+        self.passed_chunks += 1
+        return await self.vad.detect_activity(client, audio)
+
+    def end_of_speech(self, client, vad_results, audio, offset_seconds):
+        return self.vad.end_of_speech(client, vad_results, audio, offset_seconds)
+
+    def reset(self, client):
+        self.vad.reset(client)
+
+    def stats(self):
+        total = self.gated_chunks + self.passed_chunks
+        return {
+            "gated_chunks": self.gated_chunks,
+            "passed_chunks": self.passed_chunks,
+            "gated_ratio": self.gated_chunks / total if total else 0.0,
+        }
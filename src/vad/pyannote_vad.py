@@ -1,12 +1,12 @@
-import os
-from os import remove
-
 from pyannote.audio import Model
 from pyannote.audio.pipelines import VoiceActivityDetection
 
-from src.audio_utils import save_audio_to_file
+from src.audio_utils import AudioSegment
+from src.inference_executor import run_inference
+from src.micro_batcher import get_micro_batcher
 
-from .vad_interface import VADInterface
+from .batched_segmentation import BatchedSegmentation
+from .vad_interface import IncrementalVADState, VADInterface
 
 
 class PyannoteVAD(VADInterface):
@@ -17,6 +17,14 @@ class PyannoteVAD(VADInterface):
         Args:
             model_name (str): The model name for Pyannote.
             auth_token (str, optional): Authentication token for Hugging Face.
+            incremental (bool, optional): Only score audio that arrived since
+                the previous call (plus ``context_seconds``) and reuse the
+                segments found before. Defaults to False.
+            context_seconds (float, optional): Already analyzed audio that is
+                re-scored with each new tail. Defaults to 1.5.
+            batched (bool, optional): Score chunks from concurrent sessions
+                together in one segmentation-model forward pass (tuned by
+                ``BATCHING.vad``). Defaults to False.
         """
 
         model_name = kwargs.get("model_name", "pyannote/segmentation")
@@ -38,24 +46,81 @@ class PyannoteVAD(VADInterface):
                 "min_duration_off": 0.3,
             },
         )
+        self.incremental = kwargs.get("incremental", False)
+        self.context_seconds = kwargs.get("context_seconds", 1.5)
+        self.min_duration_off = pyannote_args.get("min_duration_off", 0.0)
+
         self.model = Model.from_pretrained(model_name, use_auth_token=auth_token)
         self.vad_pipeline = VoiceActivityDetection(segmentation=self.model)
         self.vad_pipeline.instantiate(pyannote_args)
 
-    async def detect_activity(self, client):
-        audio_file_path = await save_audio_to_file(
-            audio_data = client.scratch_buffer, file_name = client.get_file_name(), sampling_rate = client.sampling_rate
+        self.batched = kwargs.get("batched", False)
+        if self.batched:
+            self.segmentation = BatchedSegmentation(
+                self.model,
+                onset=pyannote_args.get("onset", 0.5),
+                offset=pyannote_args.get("offset", 0.5),
+                min_duration_on=pyannote_args.get("min_duration_on", 0.0),
+                min_duration_off=self.min_duration_off,
+            )
+            self.batcher = get_micro_batcher("vad", self.segmentation, engine="vad")
+
+    async def detect_activity(self, client, audio=None):
+        if audio is None:
+            audio = AudioSegment.from_client(client)
+
+        if self.incremental:
+            return await self.detect_activity_incremental(client, audio)
+
+        return await self._segment(audio)
+
+    async def detect_activity_incremental(self, client, audio):
+        """
+        Scores only the audio added since the previous call plus a context
+        window, keeping the segments already found for the rest. The cost per
+        chunk stays constant however long the utterance grows.
+        """
+        state = getattr(client, "vad_state", None)
+        if state is None or state.analyzed_seconds > audio.duration:
+            state = IncrementalVADState()
+            client.vad_state = state
+
+        tail_start = max(0.0, state.analyzed_seconds - self.context_seconds)
+        tail_segments = await self._segment(
+            audio.slice(tail_start), offset_seconds=tail_start
         )
-        vad_results = self.vad_pipeline(audio_file_path)
-        
+
+        state.merge(tail_start, tail_segments, max_gap_seconds=self.min_duration_off)
+        state.analyzed_seconds = audio.duration
+
+        return [dict(segment) for segment in state.segments]
+
+    def reset(self, client):
+        client.vad_state = None
+
+    async def _segment(self, audio, offset_seconds=0.0):
+        if self.batched and audio.sampling_rate == self.segmentation.sample_rate:
+            segments = await self.batcher.submit(audio.to_float32())
+            for segment in segments:
+                segment["start"] += offset_seconds
+                segment["end"] += offset_seconds
+            return segments
+
+        vad_results = await run_inference(
+            "vad",
+            self.vad_pipeline,
+            {"waveform": audio.to_waveform(), "sample_rate": audio.sampling_rate},
+        )
+
         vad_segments = []
         if len(vad_results) > 0:
             vad_segments = [
-                {"start": segment.start, "end": segment.end, "confidence": 1.0}
+                {
+                    "start": offset_seconds + segment.start,
+                    "end": offset_seconds + segment.end,
+                    "confidence": 1.0,
+                }
                 for segment in vad_results.itersegments()
             ]
-        else:
-            pass
-        
-            
+
         return vad_segments
@@ -1,3 +1,4 @@
+from .energy_vad import EnergyVAD, GatedVAD
 from .pyannote_vad import PyannoteVAD
 
 
@@ -12,7 +13,9 @@ class VADFactory:
         Creates a VAD pipeline based on the specified type.
 
         Args:
-            type (str): The type of VAD pipeline to create (e.g., 'pyannote').
+            type (str): The type of VAD pipeline to create: 'pyannote',
+                        'energy', or 'pyannote_gated' (pyannote behind an
+                        energy pre-VAD configured by kwargs['energy_args']).
             kwargs: Additional arguments for the VAD pipeline creation.
 
         Returns:
@@ -20,5 +23,10 @@ class VADFactory:
         """
         if type == "pyannote":
             return PyannoteVAD(**kwargs)
+        elif type == "energy":
+            return EnergyVAD(**kwargs)
+        elif type == "pyannote_gated":
+            energy_args = kwargs.pop("energy_args", {})
+            return GatedVAD(EnergyVAD(**energy_args), PyannoteVAD(**kwargs))
         else:
             raise ValueError(f"Unknown VAD pipeline type: {type}")
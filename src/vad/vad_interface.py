@@ -3,12 +3,14 @@ class VADInterface:
     Interface for voice activity detection (VAD) systems.
     """
 
-    async def detect_activity(self, client):
+    async def detect_activity(self, client, audio=None):
         """
         Detects voice activity in the given audio data.
 
         Args:
             client (src.Client): The client to detect on
+            audio (src.audio_utils.AudioSegment, optional): The audio to run
+                on. Defaults to the client's scratch buffer.
 
         Returns:
             List: VAD result, a list of objects containing "start", "end",
@@ -17,3 +19,75 @@ class VADInterface:
         raise NotImplementedError(
             "This method should be implemented by subclasses."
         )
+
+    def end_of_speech(self, client, vad_results, audio, offset_seconds):
+        """
+        Decides whether the speech in ``audio`` has ended.
+
+        Args:
+            client (src.Client): The client the results belong to.
+            vad_results (List): The result of the last detect_activity call.
+            audio (src.audio_utils.AudioSegment): The audio it ran on.
+            offset_seconds (float): Trailing silence required after the last
+                                    speech segment.
+
+        Returns:
+            bool: True when the utterance can be sent to ASR.
+        """
+        if not vad_results:
+            return False
+        return vad_results[-1]["end"] < audio.duration - offset_seconds
+
+    def reset(self, client):
+        """
+        Forgets any per-client state kept between detect_activity calls.
+        Called whenever the client's scratch buffer is cleared.
+
+        Args:
+            client (src.Client): The client whose utterance ended.
+        """
+        pass
+
+    def stats(self):
+        """
+        Returns:
+            dict: Counters describing the work this VAD has done or skipped.
+        """
+        return {}
+
+
+class IncrementalVADState:
+    """
+    Per-client VAD results for the part of an utterance already analyzed.
+
+    Attributes:
+        analyzed_seconds (float): How much of the scratch buffer has been
+                                  scored so far.
+        segments (List): Speech segments found so far, in seconds from the
+                         start of the scratch buffer.
+    """
+
+    def __init__(self):
+        self.analyzed_seconds = 0.0
+        self.segments = []
+
+    def merge(self, tail_start, tail_segments, max_gap_seconds=0.0):
+        """
+        Replaces everything from ``tail_start`` on with ``tail_segments``.
+
+        Segments cut at ``tail_start`` are re-joined with their continuation
+        when the gap between them is at most ``max_gap_seconds``.
+        """
+        kept = []
+        for segment in self.segments:
+            if segment["start"] >= tail_start:
+                break
+            kept.append(dict(segment, end=min(segment["end"], tail_start)))
+
+        for segment in tail_segments:
+            if kept and segment["start"] - kept[-1]["end"] <= max_gap_seconds:
+                kept[-1]["end"] = max(kept[-1]["end"], segment["end"])
+            else:
+                kept.append(dict(segment))
+
+        self.segments = kept
@@ -0,0 +1,22 @@
+# tests/asr/test_riva_channel_pool.py
+
+import unittest
+
+from src.asr.riva_channel_pool import RivaChannelPool
+
+
+class TestRivaChannelPool(unittest.TestCase):
+    def test_pool_builds_against_the_pinned_client(self):
+        pool = RivaChannelPool("localhost:50051", size=2, warm_up=False)
+        self.addCleanup(pool.close)
+
+        first, second = pool.get_asr_service(), pool.get_asr_service()
+        self.assertIsNot(first, second)
+        self.assertIs(pool.get_asr_service(), first)
+        self.assertIsNotNone(pool.get_tts_service())
+        for auth in pool._auths:
+            self.assertEqual(auth.uri, "localhost:50051")
+
+
+if __name__ == "__main__":
+    unittest.main()
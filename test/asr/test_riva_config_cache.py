@@ -0,0 +1,74 @@
+# tests/asr/test_riva_config_cache.py
+
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.asr import riva_config_cache
+from src.asr.riva_config_cache import RivaRecognitionConfigCache
+
+
+def _add_word_boosting(config, words, score):
+    config.boosts.append((sorted(words), score))
+
+
+class TestRivaRecognitionConfigCache(unittest.TestCase):
+    def setUp(self):
+        stub_client = SimpleNamespace(
+            AudioEncoding=SimpleNamespace(LINEAR_PCM="LINEAR_PCM"),
+            RecognitionConfig=lambda **kwargs: SimpleNamespace(boosts=[], **kwargs),
+            add_word_boosting_to_config=_add_word_boosting,
+        )
+        patcher = mock.patch.object(riva_config_cache, "riva", SimpleNamespace(client=stub_client))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = RivaRecognitionConfigCache(model="default-model")
+
+    def test_configs_are_shared_per_key(self):
+        config = self.cache.get("banking", 16000)
+        self.assertIs(self.cache.get("banking", 16000), config)
+        self.assertIsNot(self.cache.get("banking", 8000), config)
+        self.assertIsNot(self.cache.get("banking", 16000, model="other-model"), config)
+        self.assertEqual(config.sample_rate_hertz, 16000)
+        self.assertEqual(config.model, "default-model")
+
+    def test_unboosted_domains_fall_back_to_global(self):
+        self.assertEqual(self.cache.resolve_domain(None), "global")
+        self.assertEqual(self.cache.resolve_domain("banking"), "global")
+        self.assertIs(self.cache.get("banking"), self.cache.get("global"))
+
+        self.cache.set_word_boosting("banking", {"overdraft": 20.0})
+        self.assertEqual(self.cache.resolve_domain("banking"), "banking")
+        self.assertIsNot(self.cache.get("banking"), self.cache.get("global"))
+
+    def test_set_word_boosting_rebuilds_configs_in_use(self):
+        self.cache.set_word_boosting("banking", {"overdraft": 20.0})
+        old = self.cache.get("banking", 8000)
+        self.assertEqual(self.cache.version("banking"), 1)
+
+        self.cache.set_word_boosting("banking", {"overdraft": 20.0, "escrow": 10.0})
+        self.assertEqual(self.cache.version("banking"), 2)
+        self.assertIn(("banking", 8000, "default-model", 2), self.cache._configs)
+        self.assertNotIn(("banking", 8000, "default-model", 1), self.cache._configs)
+
+        new = self.cache.get("banking", 8000)
+        self.assertIsNot(new, old)
+        self.assertEqual(old.boosts, [(["overdraft"], 20.0)])
+
+    def test_removing_boosting_falls_back_to_global(self):
+        self.cache.set_word_boosting("banking", {"overdraft": 20.0})
+        self.cache.set_word_boosting("banking", None)
+        self.assertEqual(self.cache.resolve_domain("banking"), "global")
+
+    def test_words_are_grouped_by_boost_score(self):
+        self.cache.set_word_boosting(
+            "global", {"overdraft": 20.0, "escrow": 20.0, "routing": 5.0}
+        )
+        config = self.cache.get()
+        self.assertEqual(
+            sorted(config.boosts), [(["escrow", "overdraft"], 20.0), (["routing"], 5.0)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+# tests/buffering_strategy/test_buffering_strategies.py
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from src.audio_buffer import SegmentedAudioBuffer
+from src.buffering_strategy import buffering_strategies
+from src.buffering_strategy.buffering_strategies import SilenceAtEndOfChunk
+from src.turn_tasks import Turn
+
+
+class StubClient(SimpleNamespace):
+    def start_turn(self, coro):
+        self.cancel_turn()
+        self.turn = Turn(coro, self.user_input_txt)
+        return self.turn
+
+    def cancel_turn(self):
+        return self.turn is not None and self.turn.cancel()
+
+
+class StubVAD:
+    """Reports ``segments`` for every chunk and never ends the utterance."""
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    async def detect_activity(self, client, audio=None):
+        return self.segments
+
+    def end_of_speech(self, client, vad_results, audio, offset_seconds):
+        return False
+
+    def reset(self, client):
+        pass
+
+
+class StubWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+def make_client(**kwargs):
+    client = StubClient(
+        service="s2s",
+        client_id="client-1",
+        session_id="session-1",
+        asr_engine="riva",
+        user_input_txt="",
+        user_speaking=False,
+        turn=None,
+        trace=None,
+        buffer=SegmentedAudioBuffer(),
+        scratch_buffer=SegmentedAudioBuffer(),
+        sampling_rate=16000,
+        samples_width=2,
+        chunk_offset_seconds=0.1,
+        max_utterance_seconds=30,
+        chunk_length_seconds=0.5,
+        contact_id="contact-1",
+        channel="CUSTOMER",
+        increment_file_counter=lambda: None,
+    )
+    client.scratch_buffer.append(b"\x00" * 16000)
+    for key, value in kwargs.items():
+        setattr(client, key, value)
+    return client
+
+
+class TestBargeIn(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(
+            buffering_strategies.BARGE_IN_SETTINGS, {"enabled": True, "min_speech_seconds": 0.3}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_chunk(self, client, segments):
+        websocket = StubWebSocket()
+        strategy = SilenceAtEndOfChunk(client)
+
+        async def run():
+            cleaned_up = asyncio.Event()
+
+            async def reply():
+                try:
+                    await asyncio.sleep(10)
+                finally:
+                    cleaned_up.set()
+
+            turn = client.start_turn(reply())
+            client.user_input_txt = "what is my balance"
+            await asyncio.sleep(0)
+            await strategy.process_audio_async(websocket, StubVAD(segments), asr_pipeline=None)
+            await asyncio.sleep(0)
+            return turn, cleaned_up.is_set()
+
+        turn, cleaned_up = asyncio.run(run())
+        return turn, cleaned_up, websocket.sent
+
+    def test_speech_over_a_reply_cancels_the_turn(self):
+        client = make_client()
+        turn, cleaned_up, sent = self.run_chunk(client, [{"start": 0.0, "end": 0.5}])
+
+        self.assertTrue(turn.task.cancelled())
+        self.assertTrue(cleaned_up)
+        self.assertTrue(client.user_speaking)
+        self.assertEqual(client.user_input_txt, "")
+        self.assertEqual(
+            sent, [{"type": "control", "action": "barge_in", "session_id": "session-1"}]
+        )
+
+    def test_short_speech_does_not_cancel_the_turn(self):
+        client = make_client()
+        turn, cleaned_up, sent = self.run_chunk(client, [{"start": 0.0, "end": 0.1}])
+
+        self.assertFalse(cleaned_up)
+        self.assertFalse(client.user_speaking)
+        self.assertEqual(sent, [])
+
+
+class BlockingVAD(StubVAD):
+    """Holds every pass until ``release`` is set, then ends the utterance."""
+
+    def __init__(self):
+        super().__init__([{"start": 0.0, "end": 1.0}])
+        self.release = asyncio.Event()
+
+    async def detect_activity(self, client, audio=None):
+        await self.release.wait()
+        return self.segments
+
+    def end_of_speech(self, client, vad_results, audio, offset_seconds):
+        return True
+
+
+class StubASR:
+    def __init__(self):
+        self.transcribed = []
+
+    async def transcribe(self, client, audio):
+        self.transcribed.append(bytes(audio.pcm))
+        return {"text": "hello"}
+
+
+class TestOverlappingChunks(unittest.TestCase):
+    def test_chunk_arriving_mid_pass_is_deferred_not_duplicated(self):
+        first, second = b"\x01" * 32000, b"\x02" * 32000
+        client = make_client(service="asr")
+        client.scratch_buffer.clear()
+        strategy = SilenceAtEndOfChunk(client)
+        websocket = StubWebSocket()
+        vad, asr = BlockingVAD(), StubASR()
+
+        async def settle():
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+        async def run():
+            client.buffer.append(first)
+            strategy.process_audio(websocket, vad, asr)
+            await settle()
+
+            client.buffer.append(second)
+            strategy.process_audio(websocket, vad, asr)
+            await settle()
+            self.assertEqual(len(client.buffer), len(second))
+
+            vad.release.set()
+            await settle()
+            self.assertEqual(asr.transcribed, [first])
+            self.assertEqual(len(client.buffer), len(second))
+
+            client.buffer.append(b"\x03" * 2)
+            strategy.process_audio(websocket, vad, asr)
+            await settle()
+
+        asyncio.run(run())
+        self.assertEqual(asr.transcribed, [first, second + b"\x03" * 2])
+        self.assertEqual(len(websocket.sent), 2)
+
+
+class TestTypedInput(unittest.TestCase):
+    def test_typed_input_is_answered_once(self):
+        calls = []
+
+        async def reply(client, websocket):
+            calls.append(client.user_input_txt)
+            await asyncio.sleep(10)
+
+        client = make_client(user_input_txt="hello")
+        strategy = SilenceAtEndOfChunk(client)
+
+        async def run():
+            strategy.process_audio(StubWebSocket(), StubVAD([]), asr_pipeline=None)
+            strategy.process_audio(StubWebSocket(), StubVAD([]), asr_pipeline=None)
+            await asyncio.sleep(0)
+            first = client.turn
+
+            client.user_input_txt = "goodbye"
+            strategy.process_audio(StubWebSocket(), StubVAD([]), asr_pipeline=None)
+            await asyncio.sleep(0)
+            self.assertTrue(first.task.cancelled())
+            client.cancel_turn()
+
+        with mock.patch.object(buffering_strategies, "send_dm_response_with_tts", reply):
+            asyncio.run(run())
+        self.assertEqual(calls, ["hello", "goodbye"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# tests/inference/test_inference_executor.py
+
+import asyncio
+import threading
+import time
+import unittest
+
+from src.inference_executor import InferenceExecutor, InferenceQueueFull
+
+
+class TestInferenceExecutor(unittest.TestCase):
+    def test_runs_off_the_event_loop(self):
+        executor = InferenceExecutor("test", max_workers=1)
+
+        async def run():
+            loop_thread = threading.get_ident()
+            worker_thread = await executor.run(threading.get_ident)
+            return loop_thread, worker_thread
+
+        loop_thread, worker_thread = asyncio.run(run())
+        self.assertNotEqual(loop_thread, worker_thread)
+        self.assertEqual(executor.stats()["completed"], 1)
+        executor.shutdown()
+
+    def test_bounded_queue_rejects_overflow(self):
+        executor = InferenceExecutor("test", max_workers=1, max_queue_size=1)
+
+        async def run():
+            running = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(executor.run(time.sleep, 0.0))
+            await asyncio.sleep(0.01)
+            self.assertEqual(executor.queue_depth, 1)
+            with self.assertRaises(InferenceQueueFull):
+                await executor.run(time.sleep, 0.0)
+            await asyncio.gather(running, queued)
+
+        asyncio.run(run())
+        stats = executor.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["completed"], 2)
+        self.assertGreater(stats["wait_time_max_s"], 0.1)
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
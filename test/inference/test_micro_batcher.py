@@ -0,0 +1,76 @@
+# tests/inference/test_micro_batcher.py
+
+import asyncio
+import unittest
+
+from src.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_one_batch(self):
+        batch_sizes = []
+
+        def process_batch(items):
+            batch_sizes.append(len(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(
+            "test", process_batch, engine="test", max_batch_size=8, max_wait_ms=50
+        )
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [0, 2, 4, 6, 8])
+        self.assertEqual(batch_sizes, [5])
+
+    def test_batches_are_capped_at_max_batch_size(self):
+        batch_sizes = []
+
+        def process_batch(items):
+            batch_sizes.append(len(items))
+            return items
+
+        batcher = MicroBatcher(
+            "test", process_batch, engine="test", max_batch_size=2, max_wait_ms=50
+        )
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        self.assertEqual(asyncio.run(run()), [0, 1, 2, 3, 4])
+        self.assertEqual(batch_sizes, [2, 2, 1])
+        self.assertEqual(batcher.stats()["batches"], 3)
+
+    def test_batch_failure_reaches_every_caller(self):
+        def process_batch(items):
+            raise RuntimeError("model failed")
+
+        batcher = MicroBatcher("test", process_batch, engine="test")
+
+        async def run():
+            return await asyncio.gather(
+                batcher.submit(1), batcher.submit(2), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    def test_short_result_list_fails_the_batch(self):
+        def process_batch(items):
+            return items[:-1]
+
+        batcher = MicroBatcher("test", process_batch, engine="test", max_wait_ms=50)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True),
+                timeout=1,
+            )
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
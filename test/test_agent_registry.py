@@ -0,0 +1,143 @@
+# tests/test_agent_registry.py
+
+import asyncio
+import unittest
+from unittest import mock
+
+from src.agent_registry import AgentRegistry, AgentSpec
+
+
+class TestAgentRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = AgentRegistry()
+
+    def dispatch(self, name, client=None):
+        return asyncio.run(self.registry.dispatch(name, client))
+
+    def test_unknown_agent_returns_empty_reply(self):
+        self.assertEqual(self.dispatch("missing"), "")
+
+    def test_slow_agent_times_out(self):
+        async def slow(client):
+            await asyncio.sleep(1)
+            return "late"
+
+        spec = self.registry.register(AgentSpec("slow", slow, timeout=0.01))
+        self.assertIsNone(self.dispatch("slow"))
+        self.assertEqual(spec.stats()["timeouts"], 1)
+        self.assertEqual(spec.stats()["calls"], 1)
+
+    def test_failed_attempts_are_retried(self):
+        replies = [None, "ok"]
+
+        async def flaky(client):
+            return replies.pop(0)
+
+        spec = self.registry.register(AgentSpec("flaky", flaky, retries=1))
+        self.assertEqual(self.dispatch("flaky"), "ok")
+        self.assertEqual(spec.stats()["failures"], 1)
+
+    def test_hedged_attempt_wins_over_a_stuck_one(self):
+        calls = []
+
+        async def sometimes_stuck(client):
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(1)
+            return "hedged"
+
+        self.registry.register(
+            AgentSpec("hedged", sometimes_stuck, timeout=2.0, hedge_after=0.01)
+        )
+        self.assertEqual(self.dispatch("hedged"), "hedged")
+        self.assertEqual(len(calls), 2)
+
+    def test_calls_over_the_limit_are_rejected(self):
+        async def busy(client):
+            await asyncio.sleep(0.05)
+            return "done"
+
+        spec = self.registry.register(AgentSpec("busy", busy, max_in_flight=1))
+
+        async def run():
+            return await asyncio.gather(
+                self.registry.dispatch("busy", None), self.registry.dispatch("busy", None)
+            )
+
+        self.assertEqual(asyncio.run(run()), ["done", None])
+        self.assertEqual(spec.stats()["rejected"], 1)
+
+    def test_endpoint_url_is_passed_to_the_handler(self):
+        async def echo(client, url):
+            return url
+
+        self.registry.register(AgentSpec("echo", echo, ("agents", "echo")))
+        urls = {"Urls": {"agents": {"echo": "http://agents/echo"}}}
+        with mock.patch.dict("src.agent_registry.ALL_CONFIG", urls):
+            self.assertEqual(self.dispatch("echo"), "http://agents/echo")
+
+    def collect(self, name):
+        async def run():
+            return [sentence async for sentence in self.registry.stream(name, None)]
+
+        return asyncio.run(run())
+
+    def test_stream_yields_sentences_and_records_the_call(self):
+        async def sentences(client):
+            yield "Hello."
+            yield "How can I help?"
+
+        spec = self.registry.register(
+            AgentSpec("streamed", None, timeout=1.0, stream_handler=sentences)
+        )
+        self.assertTrue(self.registry.streams("streamed"))
+        self.assertEqual(self.collect("streamed"), ["Hello.", "How can I help?"])
+        self.assertEqual(spec.stats()["calls"], 1)
+        self.assertEqual(spec.stats()["in_flight"], 0)
+
+    def test_stream_stops_at_the_first_sentence_deadline(self):
+        async def stalled(client):
+            await asyncio.sleep(1)
+            yield "late"
+
+        spec = self.registry.register(
+            AgentSpec(
+                "stalled", None, timeout=2.0, stream_handler=stalled, first_token_timeout=0.01
+            )
+        )
+        self.assertEqual(self.collect("stalled"), [])
+        self.assertEqual(spec.stats()["timeouts"], 1)
+
+    def test_stream_stops_at_the_total_deadline(self):
+        async def slow(client):
+            yield "first"
+            await asyncio.sleep(1)
+            yield "late"
+
+        spec = self.registry.register(
+            AgentSpec("slow-stream", None, timeout=0.05, stream_handler=slow)
+        )
+        self.assertEqual(self.collect("slow-stream"), ["first"])
+        self.assertEqual(spec.stats()["timeouts"], 1)
+
+    def test_streams_over_the_limit_are_rejected(self):
+        async def sentences(client):
+            await asyncio.sleep(0.05)
+            yield "done"
+
+        spec = self.registry.register(
+            AgentSpec("busy-stream", None, stream_handler=sentences, max_in_flight=1)
+        )
+
+        async def run():
+            async def collect():
+                return [s async for s in self.registry.stream("busy-stream", None)]
+
+            return await asyncio.gather(collect(), collect())
+
+        self.assertEqual(asyncio.run(run()), [["done"], []])
+        self.assertEqual(spec.stats()["rejected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
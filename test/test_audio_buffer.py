@@ -0,0 +1,49 @@
+# tests/test_audio_buffer.py
+
+import unittest
+
+from src.audio_buffer import SegmentedAudioBuffer
+
+
+class TestSegmentedAudioBuffer(unittest.TestCase):
+    def test_append_keeps_frames_without_copying(self):
+        frame = b"\x01\x02" * 4
+        buffer = SegmentedAudioBuffer()
+        buffer.append(frame)
+
+        view = buffer.view(2, 6)
+        self.assertIs(view.obj, frame)
+        self.assertEqual(bytes(view), frame[2:6])
+
+    def test_extend_moves_frames_between_buffers(self):
+        incoming = SegmentedAudioBuffer()
+        incoming.append(b"ab")
+        incoming.append(b"cd")
+        scratch = SegmentedAudioBuffer()
+        scratch.append(b"01")
+
+        scratch += incoming
+
+        self.assertEqual(len(incoming), 0)
+        self.assertEqual(len(scratch), 6)
+        self.assertEqual(scratch.to_bytes(), b"01abcd")
+        self.assertEqual(bytes(scratch.view(1, 5)), b"1abc")
+
+    def test_is_full_at_max_bytes(self):
+        buffer = SegmentedAudioBuffer(max_bytes=4)
+        buffer.append(b"ab")
+        self.assertFalse(buffer.is_full)
+        buffer.append(b"cd")
+        self.assertTrue(buffer.is_full)
+
+    def test_ring_buffer_evicts_oldest_frames(self):
+        buffer = SegmentedAudioBuffer(max_bytes=4, ring=True)
+        for frame in (b"ab", b"cd", b"ef"):
+            buffer.append(frame)
+
+        self.assertEqual(buffer.to_bytes(), b"cdef")
+        self.assertEqual(buffer.dropped_bytes, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+# tests/test_chat_history.py
+
+import unittest
+
+from src.chat_history import ChatHistory, estimate_tokens
+
+
+class TestChatHistory(unittest.TestCase):
+    def test_system_prompt_is_sent_once(self):
+        history = ChatHistory("Be kind.")
+        history.add_user("hello")
+        history.add_assistant("hi there")
+        history.add_user("how are you")
+
+        messages = history.messages()
+        self.assertEqual(messages[0], {"role": "system", "content": "Be kind."})
+        self.assertEqual([m["role"] for m in messages], ["system", "user", "assistant", "user"])
+
+    def test_window_stays_within_budget(self):
+        turn = "x" * 40
+        history = ChatHistory("Be kind.", max_tokens=4 * estimate_tokens(turn))
+        for _ in range(50):
+            history.add_user(turn)
+            history.add_assistant(turn)
+
+        self.assertLessEqual(history.tokens, history.max_tokens)
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history.messages()[1]["role"], "user")
+
+    def test_latest_message_is_kept_even_over_budget(self):
+        history = ChatHistory("Be kind.", max_tokens=1)
+        history.add_user("a long question that does not fit")
+        self.assertEqual(history.messages()[-1]["content"], "a long question that does not fit")
+
+    def test_evicted_turns_are_kept_for_the_summary(self):
+        history = ChatHistory("Be kind.", max_tokens=2 * estimate_tokens("x"), summarize=True)
+        history.add_user("x")
+        history.add_assistant("y")
+        history.add_user("z")
+
+        self.assertEqual([t["content"] for t in history.take_evicted()], ["x", "y"])
+        self.assertEqual(history.take_evicted(), [])
+
+        history.set_summary(" The user said x. ")
+        self.assertEqual(
+            history.messages()[1],
+            {"role": "system", "content": "Summary of the earlier conversation: The user said x."},
+        )
+
+    def test_evicted_turns_are_dropped_without_summarize(self):
+        history = ChatHistory("Be kind.", max_tokens=1)
+        history.add_user("x")
+        history.add_user("y")
+        self.assertEqual(history.take_evicted(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# tests/test_emotion.py
+
+import asyncio
+import unittest
+from unittest import mock
+
+from src import emotion
+from src.emotion import detect_emotion, normalize_text, voice_for_emotion
+
+
+class TestEmotion(unittest.TestCase):
+    def setUp(self):
+        emotion._emotion_cache.clear()
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("  Why is my BILL so high?!  "), "why is my bill so high")
+
+    def test_detection_is_memoized_by_normalized_text(self):
+        classify = mock.AsyncMock(return_value="angry")
+        with mock.patch.object(emotion, "classify_emotion_async", classify):
+            self.assertEqual(asyncio.run(detect_emotion("Why is my bill so high?")), "angry")
+            self.assertEqual(asyncio.run(detect_emotion("why is my bill so high")), "angry")
+        classify.assert_awaited_once()
+
+    def test_failures_fall_back_to_neutral_and_are_not_cached(self):
+        classify = mock.AsyncMock(side_effect=RuntimeError("down"))
+        with mock.patch.object(emotion, "classify_emotion_async", classify):
+            self.assertEqual(asyncio.run(detect_emotion("hello")), "neutral")
+            asyncio.run(detect_emotion("hello"))
+        self.assertEqual(classify.await_count, 2)
+
+    def test_voice_for_emotion(self):
+        self.assertEqual(voice_for_emotion("English-US.Female-1", "angry"), "English-US.Female-Calm")
+        self.assertEqual(voice_for_emotion("English-US.Male-1", "happy"), "English-US.Male-Happy")
+        self.assertEqual(
+            voice_for_emotion("Magpie-Multilingual.EN-US.Female.Female-1", "neutral"),
+            "Magpie-Multilingual.EN-US.Female.Neutral",
+        )
+        self.assertEqual(voice_for_emotion("Joanna", "happy"), "Joanna")
+        self.assertIsNone(voice_for_emotion(None, "happy"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+# tests/test_payload_templates.py
+
+import json
+import unittest
+
+from src.payload_templates import PayloadTemplate, get_payload_template
+
+
+class TestPayloadTemplate(unittest.TestCase):
+    def setUp(self):
+        self.template = PayloadTemplate(
+            "test", {"persona": "Neutral", "customer_details": {"Name": "John Doe"}}
+        )
+
+    def test_render_adds_per_turn_fields(self):
+        payload = json.loads(self.template.render(user_input="hi", session_id="s1"))
+        self.assertEqual(
+            payload,
+            {
+                "persona": "Neutral",
+                "customer_details": {"Name": "John Doe"},
+                "user_input": "hi",
+                "session_id": "s1",
+            },
+        )
+
+    def test_render_replaces_static_fields(self):
+        payload = json.loads(self.template.render(persona="Emotional"))
+        self.assertEqual(payload["persona"], "Emotional")
+        self.assertEqual(len(payload), 2)
+
+    def test_overrides_only_apply_to_template_fields(self):
+        payload = json.loads(
+            self.template.render_with_overrides({"persona": "Angry", "unrelated": 1})
+        )
+        self.assertEqual(payload["persona"], "Angry")
+        self.assertNotIn("unrelated", payload)
+
+    def test_shipped_templates_load_once(self):
+        template = get_payload_template("utility_mock_call")
+        self.assertIs(get_payload_template("utility_mock_call"), template)
+        self.assertEqual(json.loads(template.render())["domain"], "Gas")
+
+
+if __name__ == "__main__":
+    unittest.main()
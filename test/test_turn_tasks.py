@@ -0,0 +1,43 @@
+# tests/test_turn_tasks.py
+
+import asyncio
+import unittest
+
+from src.turn_tasks import Turn
+
+
+class TestTurn(unittest.TestCase):
+    def test_cancel_stops_the_turn_and_what_it_started(self):
+        async def run():
+            async def reply():
+                helper = asyncio.ensure_future(asyncio.sleep(10))
+                try:
+                    await helper
+                finally:
+                    helper.cancel()
+
+            turn = Turn(reply(), "hello")
+            await asyncio.sleep(0)
+            self.assertTrue(turn.active)
+            self.assertEqual(turn.text, "hello")
+
+            self.assertTrue(turn.cancel())
+            with self.assertRaises(asyncio.CancelledError):
+                await turn.task
+            self.assertFalse(turn.active)
+            self.assertEqual(len(asyncio.all_tasks()), 1)
+
+        asyncio.run(run())
+
+    def test_finished_turn_is_not_active(self):
+        async def run():
+            turn = Turn(asyncio.sleep(0))
+            await turn.task
+            self.assertFalse(turn.active)
+            self.assertFalse(turn.cancel())
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
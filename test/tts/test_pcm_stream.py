@@ -0,0 +1,65 @@
+# tests/tts/test_pcm_stream.py
+
+import asyncio
+import struct
+import time
+import unittest
+
+from src.tts.pcm_stream import send_pcm_stream, streaming_wav_header
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def send_bytes(self, data):
+        self.frames.append(data)
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestPcmStream(unittest.TestCase):
+    def test_wav_header(self):
+        header = streaming_wav_header(16000)
+        self.assertEqual(len(header), 44)
+        self.assertEqual(header[:4], b"RIFF")
+        self.assertEqual(struct.unpack("<I", header[24:28])[0], 16000)
+
+    def test_chunks_are_reframed(self):
+        websocket = FakeWebSocket()
+        # 10 ms at 16 kHz is 320 bytes.
+        sent = asyncio.run(
+            send_pcm_stream(
+                websocket,
+                _chunks(b"\x00" * 500, b"\x00" * 500),
+                16000,
+                frame_ms=10,
+                realtime_pacing=False,
+            )
+        )
+        self.assertEqual(sent, 1000)
+        self.assertEqual(len(websocket.frames[0]), 44)
+        self.assertEqual([len(f) for f in websocket.frames[1:]], [320, 320, 320, 40])
+
+    def test_realtime_pacing(self):
+        websocket = FakeWebSocket()
+        start = time.perf_counter()
+        # 200 ms of audio with a 50 ms prebuffer takes about 150 ms to send.
+        asyncio.run(
+            send_pcm_stream(
+                websocket,
+                _chunks(b"\x00" * 6400),
+                16000,
+                frame_ms=20,
+                realtime_pacing=True,
+                prebuffer_ms=50,
+            )
+        )
+        self.assertGreaterEqual(time.perf_counter() - start, 0.12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# tests/tts/test_phrase_cache.py
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from src.tts.phrase_cache import TTSPhraseCache, pcm_to_wav, tts_cache_key
+
+
+class TestTTSPhraseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_key_normalizes_whitespace_only(self):
+        key = tts_cache_key("riva", "English-US.Female-1", None, 16000, "Hello there.")
+        self.assertEqual(key, tts_cache_key("riva", "English-US.Female-1", None, 16000, "  Hello   there. "))
+        self.assertNotEqual(key, tts_cache_key("riva", "English-US.Male-1", None, 16000, "Hello there."))
+        self.assertNotEqual(key, tts_cache_key("riva", "English-US.Female-1", None, 22050, "Hello there."))
+
+    def test_disk_tier_survives_a_new_cache(self):
+        cache = TTSPhraseCache(disk_dir=self.tmp.name)
+        asyncio.run(cache.set("k", b"audio", cacheable=True))
+
+        fresh = TTSPhraseCache(disk_dir=self.tmp.name)
+        self.assertEqual(asyncio.run(fresh.get("k")), b"audio")
+        self.assertEqual(fresh.stats()["disk_hits"], 1)
+        self.assertIsNone(asyncio.run(fresh.get("missing")))
+
+    def test_disk_tier_evicts_least_recently_used(self):
+        cache = TTSPhraseCache(memory_max_items=1, disk_dir=self.tmp.name, disk_max_bytes=25)
+        asyncio.run(cache.set("old", b"x" * 10, cacheable=True))
+        os.utime(os.path.join(self.tmp.name, "old.wav"), (time.time() - 60, time.time() - 60))
+        asyncio.run(cache.set("new", b"x" * 10, cacheable=True))
+        asyncio.run(cache.set("newest", b"x" * 10, cacheable=True))
+
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["new.wav", "newest.wav"])
+        self.assertLessEqual(cache.stats()["disk_bytes"], 25)
+
+    def test_dynamic_replies_are_not_cached_by_default(self):
+        cache = TTSPhraseCache(disk_dir=self.tmp.name)
+        asyncio.run(cache.set("reply", b"audio"))
+
+        self.assertIsNone(asyncio.run(cache.get("reply")))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_dynamic_replies_opt_in_stays_in_memory(self):
+        cache = TTSPhraseCache(disk_dir=self.tmp.name, cache_replies=True)
+        asyncio.run(cache.set("reply", b"audio"))
+
+        self.assertEqual(asyncio.run(cache.get("reply")), b"audio")
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_pcm_to_wav(self):
+        wav = pcm_to_wav(b"\x00\x00" * 160, 16000)
+        self.assertEqual(wav[:4], b"RIFF")
+        self.assertEqual(len(wav), 44 + 320)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# tests/tts/test_pipeline.py
+
+import asyncio
+import unittest
+
+from src.tts import pipeline
+from src.tts.pipeline import synthesize_in_order
+
+
+async def _items(*items):
+    for item in items:
+        yield item
+
+
+async def _collect(agen):
+    return [result async for result in agen]
+
+
+class TestSynthesizeInOrder(unittest.TestCase):
+    def setUp(self):
+        pipeline._semaphores.clear()
+
+    def test_results_keep_input_order(self):
+        delays = {"a": 0.05, "b": 0.0, "c": 0.02}
+
+        async def synthesize(item):
+            await asyncio.sleep(delays[item])
+            return item.upper()
+
+        results = asyncio.run(_collect(synthesize_in_order(_items("a", "b", "c"), synthesize, "test")))
+        self.assertEqual(results, [("a", "A"), ("b", "B"), ("c", "C")])
+
+    def test_parallelism_is_bounded_per_engine(self):
+        running = 0
+        peak = 0
+
+        async def synthesize(item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return item
+
+        async def run():
+            pipeline._semaphores["test"] = asyncio.Semaphore(2)
+            return await _collect(synthesize_in_order(_items(*"abcdef"), synthesize, "test"))
+
+        self.assertEqual(len(asyncio.run(run())), 6)
+        self.assertEqual(peak, 2)
+
+    def test_lookahead_is_bounded_per_reply(self):
+        started = []
+        delivered = []
+        ahead = 0
+
+        async def synthesize(item):
+            started.append(item)
+            return item
+
+        async def run():
+            nonlocal ahead
+            async for item, _ in synthesize_in_order(_items(*"abcdef"), synthesize, "test", lookahead=1):
+                await asyncio.sleep(0.01)
+                ahead = max(ahead, len(started) - len(delivered) - 1)
+                delivered.append(item)
+
+        asyncio.run(run())
+        self.assertEqual(delivered, list("abcdef"))
+        self.assertEqual(ahead, 1)
+
+    def test_failure_raises_in_turn(self):
+        async def synthesize(item):
+            if item == "b":
+                raise RuntimeError("tts down")
+            return item
+
+        async def run():
+            delivered = []
+            with self.assertRaises(RuntimeError):
+                async for item, _ in synthesize_in_order(_items("a", "b", "c"), synthesize, "test"):
+                    delivered.append(item)
+            return delivered
+
+        self.assertEqual(asyncio.run(run()), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+# tests/utils/test_http_client.py
+
+import asyncio
+import unittest
+
+from src.utils.http_client import close_http_clients, get_http_client
+
+
+class TestHttpClient(unittest.TestCase):
+    def tearDown(self):
+        asyncio.run(close_http_clients())
+
+    def test_one_pooled_client_per_verify_flag(self):
+        verified = get_http_client()
+        self.assertIs(get_http_client(verify=True), verified)
+        self.assertIsNot(get_http_client(verify=False), verified)
+
+    def test_one_pooled_client_per_proxy(self):
+        direct = get_http_client()
+        proxied = get_http_client(proxy="http://proxy.local:8080")
+        self.assertIsNot(proxied, direct)
+        self.assertIs(get_http_client(proxy="http://proxy.local:8080"), proxied)
+        self.assertIs(get_http_client(proxy=""), direct)
+
+    def test_closed_client_is_replaced(self):
+        client = get_http_client()
+        asyncio.run(close_http_clients())
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(get_http_client(), client)
+
+
+if __name__ == "__main__":
+    unittest.main()
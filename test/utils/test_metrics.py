@@ -0,0 +1,77 @@
+# tests/utils/test_metrics.py
+
+import unittest
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from src.audio_buffer import SegmentedAudioBuffer
+from src.utils.metrics import (
+    ASR_LATENCY,
+    label_value,
+    render_metrics,
+    track_clients,
+    track_latency,
+    track_stats,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_track_latency_observes_and_releases_in_flight(self):
+        labels = {"engine": "riva"}
+        before = REGISTRY.get_sample_value("asr_latency_seconds_count", labels) or 0
+
+        with track_latency(ASR_LATENCY, "asr", engine="riva"):
+            in_flight = REGISTRY.get_sample_value("in_flight_tasks", {"stage": "asr"})
+            self.assertGreaterEqual(in_flight, 1)
+
+        self.assertEqual(
+            REGISTRY.get_sample_value("asr_latency_seconds_count", labels), before + 1
+        )
+        self.assertEqual(REGISTRY.get_sample_value("in_flight_tasks", {"stage": "asr"}), 0)
+
+    def test_unknown_engines_are_recorded_as_other(self):
+        labels = {"engine": "other"}
+        before = REGISTRY.get_sample_value("asr_latency_seconds_count", labels) or 0
+
+        with track_latency(ASR_LATENCY, "asr", engine="no-such-engine"):
+            pass
+
+        self.assertEqual(
+            REGISTRY.get_sample_value("asr_latency_seconds_count", labels), before + 1
+        )
+        self.assertIsNone(
+            REGISTRY.get_sample_value("asr_latency_seconds_count", {"engine": "no-such-engine"})
+        )
+        self.assertEqual(label_value("tts_engine", "polly"), "polly")
+        self.assertEqual(label_value("tts_engine", "x" * 40), "other")
+
+    def test_stats_are_read_at_scrape_time(self):
+        counters = {"hits": 1, "memory": {"size": 2}, "disk_dir": "tts_cache"}
+        track_stats("test_cache", lambda: counters)
+        track_stats("test_pool", lambda: {"vad": {"in_flight": 3}}, label="executor")
+        counters["hits"] = 5
+
+        self.assertEqual(REGISTRY.get_sample_value("test_cache_hits"), 5)
+        self.assertEqual(REGISTRY.get_sample_value("test_cache_memory_size"), 2)
+        self.assertIsNone(REGISTRY.get_sample_value("test_cache_disk_dir"))
+        self.assertEqual(
+            REGISTRY.get_sample_value("test_pool_in_flight", {"executor": "vad"}), 3
+        )
+
+    def test_client_gauges_follow_the_registry(self):
+        client = SimpleNamespace(
+            buffer=SegmentedAudioBuffer(), scratch_buffer=SegmentedAudioBuffer()
+        )
+        client.buffer.append(b"\x00" * 10)
+        client.scratch_buffer.append(b"\x00" * 6)
+        track_clients({"a": client})
+
+        self.assertEqual(REGISTRY.get_sample_value("connected_clients"), 1)
+        self.assertEqual(REGISTRY.get_sample_value("audio_buffer_bytes"), 16)
+        data, _ = render_metrics()
+        self.assertIn(b"chunk_processing_overlaps_total", data)
+
+
+if __name__ == "__main__":
+    unittest.main()
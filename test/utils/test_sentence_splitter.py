@@ -0,0 +1,45 @@
+# tests/utils/test_sentence_splitter.py
+
+import unittest
+
+from src.utils.sentence_splitter import SentenceSplitter, split_sentences
+
+
+class TestSentenceSplitter(unittest.TestCase):
+    def feed_all(self, splitter, deltas):
+        sentences = []
+        for delta in deltas:
+            sentences.extend(splitter.feed(delta))
+        return sentences + splitter.flush()
+
+    def test_sentences_are_emitted_as_soon_as_they_end(self):
+        splitter = SentenceSplitter()
+        self.assertEqual(splitter.feed("I understand your concern about"), [])
+        self.assertEqual(
+            splitter.feed(" the bill. Let me check"),
+            ["I understand your concern about the bill."],
+        )
+        self.assertEqual(splitter.flush(), ["Let me check"])
+
+    def test_decimals_and_abbreviations_do_not_split(self):
+        splitter = SentenceSplitter(min_chars=1)
+        sentences = self.feed_all(
+            splitter, ["Dr. Carter charged ", "$3.5 for it. ", "Anything else?"]
+        )
+        self.assertEqual(sentences, ["Dr. Carter charged $3.5 for it.", "Anything else?"])
+
+    def test_short_sentences_are_joined(self):
+        splitter = SentenceSplitter(min_chars=20)
+        sentences = self.feed_all(splitter, ["Sure. I can help with that today. Bye"])
+        self.assertEqual(sentences, ["Sure. I can help with that today.", "Bye"])
+
+    def test_split_sentences(self):
+        self.assertEqual(
+            split_sentences("Your order has shipped today. It arrives on Monday."),
+            ["Your order has shipped today.", "It arrives on Monday."],
+        )
+        self.assertEqual(split_sentences(""), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# tests/utils/test_tracing.py
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from src.utils.tracing import SpanExporter, current_trace, span, start_trace, use_trace
+
+
+class TestTracing(unittest.TestCase):
+    def test_spans_nest_and_follow_tasks(self):
+        async def stage():
+            with span("dialogue_manager"):
+                with span("agent"):
+                    await asyncio.sleep(0)
+
+        async def run():
+            trace = start_trace("utterance", client_id="c1")
+            with span("asr"):
+                await asyncio.sleep(0)
+            await asyncio.create_task(stage())
+            return trace
+
+        trace = asyncio.run(run())
+        names = [s.name for s in trace.spans]
+        self.assertEqual(names, ["utterance", "asr", "dialogue_manager", "agent"])
+
+        by_name = {s.name: s for s in trace.spans}
+        self.assertEqual(by_name["agent"].parent_id, by_name["dialogue_manager"].span_id)
+        self.assertEqual(by_name["dialogue_manager"].parent_id, trace.root.span_id)
+
+        trace.root.end()
+        timings = trace.timings()
+        self.assertEqual(set(timings), {"asr", "dialogue_manager", "agent", "total"})
+
+    def test_span_without_trace_is_a_no_op(self):
+        use_trace(None)
+        with span("vad") as current:
+            self.assertIsNone(current)
+        self.assertIsNone(current_trace())
+
+    def test_exporter_writes_otlp_json_lines(self):
+        trace = start_trace("utterance")
+        with span("vad", engine="pyannote"):
+            pass
+        trace.root.end()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traces.jsonl")
+            exporter = SpanExporter(path=path)
+            exporter.export(trace)
+            for _ in range(100):
+                if os.path.exists(path) and os.path.getsize(path):
+                    break
+                time.sleep(0.01)
+
+            with open(path) as fh:
+                payload = json.loads(fh.readline())
+
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual([s["name"] for s in spans], ["utterance", "vad"])
+        self.assertEqual(spans[1]["parentSpanId"], spans[0]["spanId"])
+        self.assertEqual(spans[1]["attributes"][0]["value"], {"stringValue": "pyannote"})
+        self.assertEqual(len(spans[0]["traceId"]), 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# tests/vad/test_batched_segmentation.py
+
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+from src.vad.batched_segmentation import BatchedSegmentation
+
+
+class LoudnessModel(torch.nn.Module):
+    """Scores a 10 ms frame as speech when its peak amplitude exceeds 0.1."""
+
+    def __init__(self):
+        super().__init__()
+        self.scale = torch.nn.Parameter(torch.ones(1))
+        self.specifications = SimpleNamespace(duration=1.0, powerset=False)
+        self.audio = SimpleNamespace(sample_rate=1000)
+        self.batch_sizes = []
+
+    def forward(self, waveforms):
+        self.batch_sizes.append(waveforms.shape[0])
+        frames = waveforms.reshape(waveforms.shape[0], 100, 10).abs().amax(dim=-1)
+        return (frames > 0.1).float().unsqueeze(-1) * self.scale
+
+
+class TestBatchedSegmentation(unittest.TestCase):
+    def setUp(self):
+        self.model = LoudnessModel()
+        self.segmentation = BatchedSegmentation(
+            self.model, min_duration_on=0.05, min_duration_off=0.1
+        )
+
+    def test_sessions_share_one_forward_pass(self):
+        first = np.zeros(1500, dtype=np.float32)
+        first[200:600] = 0.5
+        second = np.zeros(800, dtype=np.float32)
+        second[100:300] = 0.5
+
+        results = self.segmentation([first, second])
+
+        self.assertEqual(self.model.batch_sizes, [3])
+        self.assertEqual(len(results), 2)
+        self.assertAlmostEqual(results[0][0]["start"], 0.2)
+        self.assertAlmostEqual(results[0][0]["end"], 0.6)
+        self.assertAlmostEqual(results[1][0]["start"], 0.1)
+        self.assertAlmostEqual(results[1][0]["end"], 0.3)
+
+    def test_binarize_merges_short_pauses_and_drops_short_segments(self):
+        scores = np.array([0, 1, 1, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0], dtype=np.float32)
+
+        segments = self.segmentation.binarize(scores, frame_seconds=0.02)
+
+        self.assertEqual(len(segments), 1)
+        self.assertAlmostEqual(segments[0]["start"], 0.02)
+        self.assertAlmostEqual(segments[0]["end"], 0.12)
+
+
+if __name__ == "__main__":
+    unittest.main()
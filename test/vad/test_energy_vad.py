@@ -0,0 +1,64 @@
+# tests/vad/test_energy_vad.py
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.audio_utils import AudioSegment
+from src.vad.energy_vad import EnergyVAD, GatedVAD
+from src.vad.vad_interface import VADInterface
+
+
+def to_segment(samples, sampling_rate=16000):
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+    return AudioSegment(pcm, sampling_rate=sampling_rate)
+
+
+class CountingVAD(VADInterface):
+    def __init__(self):
+        self.calls = 0
+
+    async def detect_activity(self, client, audio=None):
+        self.calls += 1
+        return [{"start": 0.0, "end": audio.duration, "confidence": 1.0}]
+
+
+class TestEnergyVAD(unittest.TestCase):
+    def setUp(self):
+        self.vad = EnergyVAD()
+        self.client = SimpleNamespace(noise_floor=None)
+        rng = np.random.default_rng(0)
+        self.silence = rng.normal(0, 0.0005, 16000)
+        t = np.arange(16000) / 16000
+        self.tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+
+    def test_silence_has_no_segments(self):
+        vad_results = asyncio.run(
+            self.vad.detect_activity(self.client, to_segment(self.silence))
+        )
+        self.assertEqual(vad_results, [])
+
+    def test_detects_speech_like_energy(self):
+        audio = to_segment(np.concatenate([self.silence, self.tone]))
+        vad_results = asyncio.run(self.vad.detect_activity(self.client, audio))
+
+        self.assertEqual(len(vad_results), 1)
+        self.assertAlmostEqual(vad_results[0]["start"], 1.0, delta=0.05)
+        self.assertAlmostEqual(vad_results[0]["end"], 2.0, delta=0.05)
+
+    def test_gate_skips_wrapped_vad_on_silence(self):
+        wrapped = CountingVAD()
+        gated = GatedVAD(self.vad, wrapped)
+
+        asyncio.run(gated.detect_activity(self.client, to_segment(self.silence)))
+        asyncio.run(gated.detect_activity(self.client, to_segment(self.tone)))
+
+        self.assertEqual(wrapped.calls, 1)
+        self.assertEqual(gated.stats()["gated_chunks"], 1)
+        self.assertEqual(gated.stats()["passed_chunks"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/vad/test_incremental_vad_state.py
+
+import unittest
+
+from src.vad.vad_interface import IncrementalVADState
+
+
+class TestIncrementalVADState(unittest.TestCase):
+    def test_keeps_segments_before_the_rescored_tail(self):
+        state = IncrementalVADState()
+        state.segments = [
+            {"start": 0.2, "end": 1.0, "confidence": 1.0},
+            {"start": 2.0, "end": 3.0, "confidence": 1.0},
+        ]
+
+        state.merge(2.5, [{"start": 3.5, "end": 4.0, "confidence": 1.0}])
+
+        self.assertEqual(
+            [(s["start"], s["end"]) for s in state.segments],
+            [(0.2, 1.0), (2.0, 2.5), (3.5, 4.0)],
+        )
+
+    def test_rejoins_segment_cut_at_tail_start(self):
+        state = IncrementalVADState()
+        state.segments = [{"start": 1.0, "end": 3.0, "confidence": 1.0}]
+
+        state.merge(
+            2.5,
+            [{"start": 2.6, "end": 4.2, "confidence": 1.0}],
+            max_gap_seconds=0.3,
+        )
+
+        self.assertEqual(
+            [(s["start"], s["end"]) for s in state.segments], [(1.0, 4.2)]
+        )
+
+    def test_drops_speech_no_longer_found_in_tail(self):
+        state = IncrementalVADState()
+        state.segments = [
+            {"start": 0.5, "end": 1.0, "confidence": 1.0},
+            {"start": 2.6, "end": 2.9, "confidence": 1.0},
+        ]
+
+        state.merge(2.5, [])
+
+        self.assertEqual(
+            [(s["start"], s["end"]) for s in state.segments], [(0.5, 1.0)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,20 @@
-from fastapi import FastAPI, Header, HTTPException, UploadFile, File, Request, Response
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, Header, HTTPException, UploadFile, File, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from typing import List, Dict
 from pydantic import BaseModel
 from datetime import datetime
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 from tts_utils import polly_neural_tts, azure_tts, get_file_name
 
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
 import riva.client
+import struct
+import threading
 import wave
 import uuid
-import requests
 import json
 import httpx
 import os
@@ -19,6 +24,33 @@ import zipfile
 
 app = FastAPI()
 
+# The engine SDKs (Riva gRPC, Polly, Azure) block, so every engine call runs
+# on this pool instead of the event loop; requests no longer serialize.
+tts_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("TTS_WORKERS", "16")),
+    thread_name_prefix="tts",
+)
+
+# One pooled HTTP client for the health check and the CX speech proxy.
+http_client = None
+
+
+async def run_blocking(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(tts_executor, functools.partial(fn, *args, **kwargs))
+
+
+@app.on_event("startup")
+async def open_http_client():
+    global http_client
+    http_client = httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=5.0))
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    await http_client.aclose()
+    tts_executor.shutdown(wait=False)
+
 
 origins = ["*"]
 # origins = [
@@ -51,6 +83,8 @@ sampwidth = 2
 class ttsTextRequest(BaseModel):
     text: str
     emotion_detection: bool
+    # Riva only: stream the audio as it is synthesized (chunked response).
+    stream: bool = False
     # tts_engine: Optional[str] = None
 
 class TextRequest(BaseModel):
@@ -89,6 +123,73 @@ async def strip_tts_prefix(request: Request, call_next):
     return response
 
 
+def synthesize_riva_to_file(text, voice, file_name):
+    resp = tts_service.synthesize(text, language_code=language_code, sample_rate_hz=sample_rate_hz, voice_name=voice)
+
+    # Save the audio to a file
+    with wave.open(file_name, 'wb') as out_f:
+        out_f.setnchannels(nchannels)
+        out_f.setsampwidth(sampwidth)
+        out_f.setframerate(sample_rate_hz)
+        out_f.writeframesraw(resp.audio)
+
+
+def streaming_wav_header():
+    # Sizes are unknown while streaming, so they are set to the maximum.
+    byte_rate = sample_rate_hz * nchannels * sampwidth
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, nchannels, sample_rate_hz, byte_rate, nchannels * sampwidth, 8 * sampwidth)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+async def stream_riva_wav(text, voice):
+    """
+    Yield a WAV header, then PCM chunks as ``synthesize_online`` produces
+    them. The gRPC stream is read on the worker pool and cancelled if the
+    client goes away.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = threading.Event()
+    end = object()
+
+    def produce():
+        try:
+            responses = tts_service.synthesize_online(
+                text,
+                voice_name=voice,
+                language_code=language_code,
+                encoding=riva.client.AudioEncoding.LINEAR_PCM,
+                sample_rate_hz=sample_rate_hz,
+            )
+            for resp in responses:
+                if stop.is_set():
+                    responses.cancel()
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, resp.audio)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, end)
+
+    loop.run_in_executor(tts_executor, produce)
+    try:
+        yield streaming_wav_header()
+        while True:
+            item = await queue.get()
+            if item is end:
+                break
+            if isinstance(item, Exception):
+                # The response has started; all that can be done is stop.
+                print(f"Riva streaming synthesis failed: {item}")
+                break
+            yield item
+    finally:
+        stop.set()
+
+
 @app.get("/health_tts")
 async def health_check():
     return JSONResponse(content={"status": "ok"}, status_code=200)
@@ -97,8 +198,7 @@ async def health_check():
 async def health_check():
     try:
         # Make an asynchronous request to localhost:5000/health
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://127.0.0.1:6000/health",timeout=10.0)
+        response = await http_client.get("http://127.0.0.1:6000/health",timeout=10.0)
         # response = requests.get("http://localhost:5000/health",timeout=10.0)
         # If the response is 200, return "ok"
         if response.status_code == 200:
@@ -117,7 +217,7 @@ async def health_check():
 async def emotion_classify(request: TextRequest):
     try:
         text = request.text
-        response = emotion_detection_riva(text)
+        response = await run_blocking(emotion_detection_riva, text)
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -142,10 +242,10 @@ async def synthesize(request: ttsTextRequest, voice: str = Header(default=""),en
             voice = default_voices[engine]
 
         if engine == "polly":
-            polly_neural_tts(text, file_name,voice_id=voice)
+            await run_blocking(polly_neural_tts, text, file_name, voice_id=voice)
 
         if engine=="azure":
-            azure_tts(text, file_name, voice_id=voice)
+            await run_blocking(azure_tts, text, file_name, voice_id=voice)
 
         # Synthesize speech
 
@@ -154,7 +254,7 @@ async def synthesize(request: ttsTextRequest, voice: str = Header(default=""),en
 
             if emotion_detection:
 
-                emotion = emotion_detection_riva(text)
+                emotion = await run_blocking(emotion_detection_riva, text)
                 if emotion != None:
                     emotion = str(emotion.get("emotion")).capitalize()
 
@@ -170,21 +270,15 @@ async def synthesize(request: ttsTextRequest, voice: str = Header(default=""),en
 
                 print(f"voice chosen:{voice}")
 
-            resp = tts_service.synthesize(text, language_code=language_code, sample_rate_hz=sample_rate_hz, voice_name=voice)
-            audio = resp.audio
+            if request.stream:
+                return StreamingResponse(stream_riva_wav(text, voice), media_type='audio/wav')
 
             # Generate filename
             # unique_id = uuid.uuid4()
             # current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
             # filename = f"/home/CORP/RIVA/audios/{engine}_{unique_id}_{current_time}.wav"
 
-
-            # Save the audio to a file
-            with wave.open(file_name, 'wb') as out_f:
-                out_f.setnchannels(nchannels)
-                out_f.setsampwidth(sampwidth)
-                out_f.setframerate(sample_rate_hz)
-                out_f.writeframesraw(audio)
+            await run_blocking(synthesize_riva_to_file, text, voice, file_name)
 
         return FileResponse(file_name, media_type='audio/wav', filename=file_name)
     except Exception as e:
@@ -305,15 +399,21 @@ async def cx_speech_tts(request: Request):
         body = await request.json()
         print("Incoming body:", body)
 
-        internal_resp = requests.post(INTERNAL_CX_SPEECH_TTS_API_URL, json=body)
-        internal_resp.raise_for_status()
-
-        return Response(
-            content=internal_resp.content,
-            media_type=internal_resp.headers.get("Content-Type", "audio/wav")
+        internal_req = http_client.build_request("POST", INTERNAL_CX_SPEECH_TTS_API_URL, json=body)
+        internal_resp = await http_client.send(internal_req, stream=True)
+        if internal_resp.is_error:
+            await internal_resp.aread()
+            await internal_resp.aclose()
+            internal_resp.raise_for_status()
+
+        # Audio is relayed as it arrives instead of after the whole body.
+        return StreamingResponse(
+            internal_resp.aiter_bytes(),
+            media_type=internal_resp.headers.get("Content-Type", "audio/wav"),
+            background=BackgroundTask(internal_resp.aclose),
         )
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"Internal TTS service error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")